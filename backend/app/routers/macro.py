@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 import random
 import logging
 import math
-from app.services.macro_analyzer import MacroAnalyzer
+from app.services.macro_analyzer import get_macro_analyzer
 from app.services.yfinance_service import get_yfinance_service
 from app.services.market_data_service import get_market_data_service
 from database.redis.config import get_redis_cache
@@ -18,16 +18,6 @@ router = APIRouter(
     tags=["macro"]
 )
 
-# Initialize macro analyzer
-_macro_analyzer = None
-
-def get_macro_analyzer():
-    """Get or create MacroAnalyzer singleton"""
-    global _macro_analyzer
-    if _macro_analyzer is None:
-        _macro_analyzer = MacroAnalyzer()
-    return _macro_analyzer
-
 
 def _safe_float(value: Optional[float]) -> Optional[float]:
     try:
@@ -9,6 +9,7 @@ import logging
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 import json
+from app.config.settings import settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -162,6 +163,21 @@ class MacroAnalyzer:
             logger.error(f"Error fetching FRED data: {e}")
             return self._get_mock_fred_data()
 
+    def get_series(self, series_id: str, observation_start: Optional[str] = None):
+        """
+        Fetch a single FRED series
+
+        Returns:
+            pandas Series indexed by date, or None if FRED is unavailable
+        """
+        if not self.fred:
+            return None
+        try:
+            return self.fred.get_series(series_id, observation_start=observation_start)
+        except Exception as e:
+            logger.warning(f"FRED series {series_id} unavailable: {e}")
+            return None
+
     def get_dxy_index(self) -> Dict:
         """
         Get US Dollar Index (DXY) current value and change
@@ -620,6 +636,18 @@ class MacroAnalyzer:
         }
 
 
+# Global singleton, configured with the app's FRED API key
+_macro_analyzer = None
+
+
+def get_macro_analyzer() -> MacroAnalyzer:
+    """Get or create the shared MacroAnalyzer"""
+    global _macro_analyzer
+    if _macro_analyzer is None:
+        _macro_analyzer = MacroAnalyzer(fred_api_key=settings.FRED_API_KEY or None)
+    return _macro_analyzer
+
+
 # Convenience functions
 
 def get_macro_dashboard(fred_api_key: Optional[str] = None, redis_client=None) -> Dict:
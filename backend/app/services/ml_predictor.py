@@ -15,14 +15,30 @@ Target: Stocks that will rise 10%+ in next 7 days
 """
 
 import os
+import shutil
+import tempfile
 import logging
+import threading
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from operator import itemgetter
 
 logger = logging.getLogger(__name__)
 
+# Per-provider concurrency caps for parallel feature extraction
+_YFINANCE_SLOTS = threading.BoundedSemaphore(8)
+_FINNHUB_SLOTS = threading.BoundedSemaphore(4)
+_NEWS_SLOTS = threading.BoundedSemaphore(4)
+
+# Shared pools: one task per ticker, and one per source fetch within a
+# ticker. They are separate so a ticker task never waits on its own pool.
+_FEATURE_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='ml-features')
+_SOURCE_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='ml-sources')
+
 
 def _calculate_rsi(series: pd.Series, length: int = 14) -> pd.Series:
     if series is None or len(series) < length + 1:
@@ -69,15 +85,110 @@ def _calculate_bbands(
     return lower, sma, upper
 
 
-try:
+def _feature_column(df: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """Return a feature column as float array, filling missing values with default"""
+    if name not in df.columns:
+        return np.full(len(df), default, dtype=float)
+    return df[name].fillna(default).to_numpy(dtype=float)
+
+
+# Signal point functions are branchless (boolean-multiply) so the same code
+# scores a single ticker's floats or whole NumPy columns for a batch.
+
+def _technical_points(rsi, macd_hist, bb_pos, vol_ratio, momentum_5d):
+    """Unclipped technical analysis score"""
+    return (
+        # RSI - oversold (< 30) is bullish, overbought (> 70) is bearish
+        0.3 * (rsi < 30) + 0.15 * ((rsi >= 30) & (rsi < 45)) - 0.2 * (rsi > 70)
+        # MACD - positive histogram and above signal line is bullish
+        + 0.2 * (macd_hist > 0)
+        # Bollinger Bands - near lower band is potential reversal
+        + (0.2 * (bb_pos < 0.2) - 0.1 * (bb_pos > 0.8))
+        # Volume surge - 2x+ average volume is strong signal
+        + (0.3 * (vol_ratio > 2.0) + 0.15 * ((vol_ratio > 1.5) & (vol_ratio <= 2.0)))
+        # Momentum - positive recent momentum
+        + (0.2 * (momentum_5d > 5) + 0.1 * ((momentum_5d > 2) & (momentum_5d <= 5)) - 0.2 * (momentum_5d < -5))
+    )
+
+
+def _sentiment_points(mentions, sentiment):
+    """Unclipped social sentiment score"""
+    return (
+        0.5  # Neutral baseline
+        # Reddit mentions (more = more interest): viral / trending / notable
+        + (0.3 * (mentions > 20) + 0.2 * ((mentions > 10) & (mentions <= 20)) + 0.1 * ((mentions > 5) & (mentions <= 10)))
+        # Reddit sentiment: very bullish / bullish / bearish
+        + (0.3 * (sentiment > 2.0) + 0.2 * ((sentiment > 1.0) & (sentiment <= 2.0)) - 0.2 * (sentiment < -1.0))
+    )
+
+
+def _news_points(has_news_bomb, news_count):
+    """Unclipped news impact score"""
+    return (
+        0.5  # Neutral baseline
+        # News bomb (high-impact event)
+        + 0.4 * (has_news_bomb == 1)
+        # Recent news volume
+        + (0.2 * (news_count > 10) + 0.1 * ((news_count > 5) & (news_count <= 10)))
+    )
+
+
+def _fundamental_points(upside, daily_change):
+    """Unclipped fundamental analysis score"""
+    return (
+        0.5  # Neutral baseline
+        # Analyst upside potential
+        + (0.3 * (upside > 20) + 0.2 * ((upside > 10) & (upside <= 20))
+           + 0.1 * ((upside > 5) & (upside <= 10)) - 0.2 * (upside < -10))
+        # Daily change momentum
+        + (0.2 * (daily_change > 3) + 0.1 * ((daily_change > 1) & (daily_change <= 3)) - 0.2 * (daily_change < -3))
+    )
+
+
+def _score_technical_batch(df: pd.DataFrame) -> np.ndarray:
+    """Technical analysis score (0-1) for each row of a feature frame"""
+    score = _technical_points(
+        _feature_column(df, 'rsi', 50),
+        _feature_column(df, 'macd_histogram', 0),
+        _feature_column(df, 'bb_position', 0.5),
+        _feature_column(df, 'volume_ratio', 1.0),
+        _feature_column(df, 'momentum_5d', 0)
+    )
+    return np.clip(score, 0.0, 1.0)
+
+
+def _score_sentiment_batch(df: pd.DataFrame) -> np.ndarray:
+    """Social sentiment score (0-1) for each row of a feature frame"""
+    score = _sentiment_points(
+        _feature_column(df, 'reddit_mentions', 0),
+        _feature_column(df, 'reddit_sentiment_score', 0)
+    )
+    return np.clip(score, 0.0, 1.0)
+
+
+def _score_news_batch(df: pd.DataFrame) -> np.ndarray:
+    """News impact score (0-1) for each row of a feature frame"""
+    score = _news_points(
+        _feature_column(df, 'has_news_bomb', 0),
+        _feature_column(df, 'news_count_7d', 0)
+    )
+    return np.clip(score, 0.0, 1.0)
+
+
+def _score_fundamental_batch(df: pd.DataFrame) -> np.ndarray:
+    """Fundamental analysis score (0-1) for each row of a feature frame"""
+    score = _fundamental_points(
+        _feature_column(df, 'upside_potential', 0),
+        _feature_column(df, 'daily_change', 0)
+    )
+    return np.clip(score, 0.0, 1.0)
+
+
+# xgboost, sklearn and yfinance are heavy to import, so they are loaded
+# lazily where first needed rather than whenever this module is imported
+if TYPE_CHECKING:
     import yfinance as yf
-    HAS_YFINANCE = True
-except ImportError:
-    HAS_YFINANCE = False
-    logger.warning("yfinance not available - will use alternative data sources")
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import xgboost as xgb
+
 import pickle
 from pathlib import Path
 
@@ -85,17 +196,199 @@ from .finnhub_service import get_finnhub_service
 from .reddit_service import get_reddit_service
 from .news_service import get_news_service
 
+
+# yf.Ticker objects are reused across predictions instead of rebuilt per call
+_TICKERS: Dict[str, "yf.Ticker"] = {}
+
+
+def _ticker(symbol: str) -> "yf.Ticker":
+    stock = _TICKERS.get(symbol)
+    if stock is None:
+        import yfinance as yf
+        stock = _TICKERS[symbol] = yf.Ticker(symbol)
+    return stock
+
+
+# Training feature columns, in model input order
+FEATURE_NAMES = [
+    'rsi', 'macd', 'macd_signal', 'macd_histogram',
+    'volume_ratio', 'momentum_5d', 'momentum_10d', 'volatility'
+]
+
+
+def _have_cuda() -> bool:
+    """Check whether XGBoost was built with CUDA and a GPU is visible"""
+    try:
+        import xgboost as xgb
+        if not xgb.build_info().get('USE_CUDA'):
+            return False
+    except Exception:
+        return False
+    if os.getenv('CUDA_VISIBLE_DEVICES', '') == '-1':
+        return False
+    return shutil.which('nvidia-smi') is not None
+
+
+def _finite_or(series: pd.Series, default: float) -> pd.Series:
+    """Replace NaN/inf entries of a series with a default"""
+    return series.where(np.isfinite(series), default)
+
+
+def _extract_historical_features(hist: pd.DataFrame) -> pd.DataFrame:
+    """
+    Extract features for every date of a price history in one pass
+
+    All indicators are causal, so row i equals the features computed on
+    hist.iloc[:i+1] - without recomputing them for every slice.
+    """
+    close = hist['Close']
+    volume = hist['Volume']
+    features = pd.DataFrame(index=hist.index)
+
+    # Technical indicators
+    rsi_series = _calculate_rsi(close, length=14).reindex(hist.index)
+    features['rsi'] = _finite_or(rsi_series, 50.0)
+
+    # MACD needs slow + signal rows before it is defined
+    macd_line, macd_signal, macd_hist = _calculate_macd(close)
+    warmup = np.arange(len(hist)) < 26 + 9 - 1
+    for name, series in (('macd', macd_line), ('macd_signal', macd_signal), ('macd_histogram', macd_hist)):
+        features[name] = _finite_or(series.reindex(hist.index), 0.0).mask(warmup, 0.0)
+
+    # Volume
+    avg_volume = volume.rolling(window=20).mean()
+    features['volume_ratio'] = np.where(avg_volume > 0, volume / avg_volume, 1.0)
+
+    # Momentum
+    features['momentum_5d'] = ((close / close.shift(4)) - 1) * 100
+    features['momentum_10d'] = ((close / close.shift(9)) - 1) * 100
+
+    # Volatility
+    features['volatility'] = close.pct_change().rolling(window=20).std() * 100
+
+    return features
+
+
+def _empty_training_block() -> Tuple[np.ndarray, np.ndarray]:
+    return np.empty((0, len(FEATURE_NAMES)), dtype=np.float32), np.empty(0, dtype=np.uint8)
+
+
+def _collect_ticker_training_data(ticker: str, lookback_days: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collect labelled training rows for one ticker
+
+    Top-level (picklable) so train_model can fan tickers out to a process pool.
+
+    Returns:
+        (X, y): float32 feature matrix in FEATURE_NAMES order and uint8 labels
+    """
+    try:
+        logger.info(f"Collecting training data for {ticker}")
+
+        # Get historical data
+        hist = _ticker(ticker).history(period=f'{lookback_days}d')
+
+        if len(hist) < 50:
+            return _empty_training_block()
+
+        # Features for every date at once (using data up to each date)
+        features = _extract_historical_features(hist)
+
+        # Label: 1 if stock rose 10%+ in next 7 days, 0 otherwise
+        close = hist['Close'].to_numpy()
+        labels = np.zeros(len(close), dtype=np.uint8)
+        labels[:-7] = (close[7:] / close[:-7] - 1) >= 0.10
+
+        # Need 20 days for indicators, 7 days for label
+        rows = slice(20, len(hist) - 7)
+        return features[FEATURE_NAMES].to_numpy(dtype=np.float32)[rows], labels[rows]
+
+    except Exception as e:
+        logger.error(f"Error collecting data for {ticker}: {str(e)}")
+        return _empty_training_block()
+
+
+def _write_training_shard(ticker: str, lookback_days: int, shard_dir: str) -> Tuple[Optional[str], int]:
+    """
+    Collect one ticker's training rows and write them to an .npz shard
+
+    Returns:
+        (path, rows): shard path (None if no rows were collected) and row count
+    """
+    X, y = _collect_ticker_training_data(ticker, lookback_days)
+    if not len(y):
+        return None, 0
+
+    fd, path = tempfile.mkstemp(dir=shard_dir, suffix='.npz')
+    with os.fdopen(fd, 'wb') as f:
+        np.savez(f, X=X, y=y)
+    return path, len(y)
+
+
+def _load_training_shard(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    with np.load(path) as shard:
+        return shard['X'], shard['y']
+
+
+def _shard_test_mask(rows: int, shard_index: int, test_size: float = 0.2) -> np.ndarray:
+    """Deterministic per-shard train/test split (same mask on every pass)"""
+    return np.random.default_rng((42, shard_index)).random(rows) < test_size
+
+
+def _shard_iterator(
+    shard_files: List[str],
+    mean: np.ndarray,
+    scale: np.ndarray,
+    feature_names: List[str],
+    test: bool,
+    cache_prefix: Optional[str] = None
+):
+    """Build an XGBoost DataIter streaming the standardized train or test rows of each shard"""
+    import xgboost as xgb
+
+    class ShardIterator(xgb.DataIter):
+        def __init__(self):
+            self._position = 0
+            super().__init__(cache_prefix=cache_prefix)
+
+        def next(self, input_data) -> bool:
+            while self._position < len(shard_files):
+                index = self._position
+                self._position += 1
+
+                X, y = _load_training_shard(shard_files[index])
+                rows = _shard_test_mask(len(y), index)
+                if not test:
+                    rows = ~rows
+                if rows.any():
+                    input_data(data=(X[rows] - mean) / scale, label=y[rows], feature_names=feature_names)
+                    return True
+            return False
+
+        def reset(self):
+            self._position = 0
+
+    return ShardIterator()
+
+
 class MLStockPredictor:
     """ML-powered stock predictor using XGBoost"""
 
+    # Histogram bins for XGBoost's hist tree method
+    MAX_BIN = 256
+
     def __init__(self):
         self.finnhub = get_finnhub_service()
         self.reddit = get_reddit_service()
         self.news = get_news_service()
 
         self.model = None
-        self.scaler = StandardScaler()
+        # StandardScaler parameters, applied by hand at prediction time
+        self.scaler_mean: Optional[np.ndarray] = None
+        self.scaler_scale: Optional[np.ndarray] = None
         self.feature_names = []
+        self._feature_getter = None
+        self._feature_defaults: Dict[str, float] = {}
 
         # Model cache path
         self.model_path = Path(__file__).parent.parent / 'models'
@@ -124,27 +417,54 @@ class MLStockPredictor:
                 'features': dict
             }
         """
+        results = self.predict_stocks([ticker])
+        return results[0] if results else None
+
+    def predict_stocks(self, tickers: List[str]) -> List[Dict]:
+        """
+        Predict a batch of stocks with one vectorized scoring pass
+
+        Signals are computed for all tickers at once and, when a trained
+        model is loaded, a single XGBoost call scores the whole batch.
+
+        Returns:
+            List of prediction dicts (same shape as predict_stock) for the
+            tickers whose features could be extracted
+        """
         try:
-            # Extract all features
-            features = self._extract_features(ticker)
-            if not features:
-                logger.warning(f"Could not extract features for {ticker}")
-                return None
+            # Ticker-independent data is fetched once for the whole batch
+            trending, news_bombs = self._fetch_shared_signals()
+
+            # Extract all features (I/O bound, so requests are overlapped)
+            features_by_ticker = self._extract_features_batch(tickers, trending, news_bombs)
+
+            extracted = []
+            for ticker, features in zip(tickers, features_by_ticker):
+                if not features:
+                    logger.warning(f"Could not extract features for {ticker}")
+                    continue
+                extracted.append((ticker, features))
+
+            if not extracted:
+                return []
+
+            features_list = [features for _, features in extracted]
+            frame = pd.DataFrame(features_list)
 
             # Calculate signal scores
             signals = {
-                'technical': self._calculate_technical_score(features),
-                'sentiment': self._calculate_sentiment_score(features),
-                'news': self._calculate_news_score(features),
-                'fundamental': self._calculate_fundamental_score(features)
+                'technical': _score_technical_batch(frame),
+                'sentiment': _score_sentiment_batch(frame),
+                'news': _score_news_batch(frame),
+                'fundamental': _score_fundamental_batch(frame)
             }
 
             # If model exists, use it for prediction
             if self.model:
-                prediction = self._predict_with_model(features)
+                predictions = self._predict_batch(features_list)
             else:
                 # Fallback: weighted combination of signals
-                prediction = (
+                predictions = (
                     signals['technical'] * 0.35 +
                     signals['sentiment'] * 0.25 +
                     signals['news'] * 0.20 +
@@ -152,269 +472,264 @@ class MLStockPredictor:
                 )
 
             # Calculate confidence (higher for extreme predictions)
-            confidence = abs(prediction - 0.5) * 200  # 0-100 scale
-
-            return {
-                'ticker': ticker,
-                'prediction': round(prediction, 3),
-                'confidence': round(confidence, 1),
-                'signals': {k: round(v, 3) for k, v in signals.items()},
-                'features': features,
-                'timestamp': datetime.now().isoformat()
-            }
+            confidences = np.abs(predictions - 0.5) * 200  # 0-100 scale
+            timestamp = datetime.now().isoformat()
+
+            return [
+                {
+                    'ticker': ticker,
+                    'prediction': round(float(predictions[i]), 3),
+                    'confidence': round(float(confidences[i]), 1),
+                    'signals': {k: round(float(v[i]), 3) for k, v in signals.items()},
+                    'features': features,
+                    'timestamp': timestamp
+                }
+                for i, (ticker, features) in enumerate(extracted)
+            ]
 
         except Exception as e:
-            logger.error(f"Error predicting {ticker}: {str(e)}")
+            logger.error(f"Error predicting {', '.join(tickers)}: {str(e)}")
+            return []
+
+    def _fetch_shared_signals(self) -> Tuple[List[Dict], List[Dict]]:
+        """Fetch Reddit trending and news bombs, which are the same for every ticker"""
+        trending: List[Dict] = []
+        news_bombs: List[Dict] = []
+
+        try:
+            trending = self.reddit.get_trending_stocks(limit=50, hours=24)
+        except Exception as e:
+            logger.warning(f"Reddit sentiment unavailable: {str(e)}")
+
+        try:
+            with _NEWS_SLOTS:
+                news_bombs = self.news.get_news_bombs(limit=20)
+        except Exception as e:
+            logger.warning(f"News bombs unavailable: {str(e)}")
+
+        return trending, news_bombs
+
+    def _extract_features_batch(
+        self,
+        tickers: List[str],
+        trending: List[Dict],
+        news_bombs: List[Dict]
+    ) -> List[Optional[Dict]]:
+        """Extract features for many tickers concurrently, in ticker order"""
+        def extract(ticker: str) -> Optional[Dict]:
+            return self._extract_features(ticker, trending=trending, news_bombs=news_bombs)
+
+        if len(tickers) <= 1:
+            return [extract(ticker) for ticker in tickers]
+        return list(_FEATURE_EXECUTOR.map(extract, tickers))
+
+    def _fetch_history(self, ticker: str) -> pd.DataFrame:
+        """Historical price data (90 days for indicators)"""
+        with _YFINANCE_SLOTS:
+            return _ticker(ticker).history(period='3mo')
+
+    def _fetch_quote(self, ticker: str) -> Optional[Dict]:
+        with _FINNHUB_SLOTS:
+            return self.finnhub.get_quote(ticker)
+
+    def _fetch_price_target(self, ticker: str) -> Optional[Dict]:
+        with _FINNHUB_SLOTS:
+            return self.finnhub.get_price_target(ticker)
+
+    def _fetch_stock_news(self, ticker: str) -> Optional[List[Dict]]:
+        """Company news for the last 7 days (None if unavailable)"""
+        try:
+            with _NEWS_SLOTS:
+                return self.news.get_stock_news(ticker, days=7)
+        except Exception as e:
+            logger.warning(f"News data unavailable for {ticker}: {str(e)}")
             return None
 
-    def _extract_features(self, ticker: str) -> Optional[Dict]:
-        """Extract all features for a stock"""
-        features = {}
+    def _extract_features(
+        self,
+        ticker: str,
+        trending: Optional[List[Dict]] = None,
+        news_bombs: Optional[List[Dict]] = None
+    ) -> Optional[Dict]:
+        """
+        Extract all features for a stock
 
+        Args:
+            ticker: Stock symbol
+            trending: Prefetched Reddit trending list (fetched if None)
+            news_bombs: Prefetched news bombs (fetched if None)
+        """
+        # The four per-ticker sources are independent requests, so overlap them
+        futures = [
+            _SOURCE_EXECUTOR.submit(fetch, ticker)
+            for fetch in (self._fetch_history, self._fetch_quote,
+                          self._fetch_price_target, self._fetch_stock_news)
+        ]
         try:
             # 1. Get historical price data (90 days for indicators)
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period='3mo')
+            hist = futures[0].result()
 
             if hist.empty or len(hist) < 20:
                 return None
 
-            # 2. Technical Indicators
-            df = hist.copy()
-
-            # RSI (Relative Strength Index)
-            rsi_series = _calculate_rsi(df['Close'], length=14)
-            rsi_value = rsi_series.iloc[-1] if not rsi_series.empty else None
-            if rsi_value is None or not np.isfinite(rsi_value):
-                rsi_value = 50
-            features['rsi'] = float(rsi_value)
-
-            # MACD (Moving Average Convergence Divergence)
-            macd_line, macd_signal, macd_hist = _calculate_macd(df['Close'])
-            if not macd_line.empty:
-                macd_value = macd_line.iloc[-1]
-                macd_signal_value = macd_signal.iloc[-1] if not macd_signal.empty else None
-                macd_hist_value = macd_hist.iloc[-1] if not macd_hist.empty else None
-                features['macd'] = float(macd_value) if np.isfinite(macd_value) else 0.0
-                features['macd_signal'] = float(macd_signal_value) if macd_signal_value is not None and np.isfinite(macd_signal_value) else 0.0
-                features['macd_histogram'] = float(macd_hist_value) if macd_hist_value is not None and np.isfinite(macd_hist_value) else 0.0
-            else:
-                features['macd'] = 0.0
-                features['macd_signal'] = 0.0
-                features['macd_histogram'] = 0.0
-
-            # Bollinger Bands
-            bb_lower, bb_mid, bb_upper = _calculate_bbands(df['Close'], length=20, std=2.0)
-            bb_position = 0.5
-            if not bb_lower.empty and not bb_upper.empty:
-                lower = bb_lower.iloc[-1]
-                upper = bb_upper.iloc[-1]
-                current_price = df['Close'].iloc[-1]
-                if np.isfinite(lower) and np.isfinite(upper) and np.isfinite(current_price) and upper != lower:
-                    bb_position = (current_price - lower) / (upper - lower)
-            features['bb_position'] = float(bb_position)
-
-            # Volume analysis
-            avg_volume = df['Volume'].rolling(window=20).mean().iloc[-1]
-            current_volume = df['Volume'].iloc[-1]
-            features['volume_ratio'] = current_volume / avg_volume if avg_volume > 0 else 1.0
-
-            # Price momentum (% change)
-            features['momentum_5d'] = ((df['Close'].iloc[-1] / df['Close'].iloc[-5]) - 1) * 100 if len(df) >= 5 else 0
-            features['momentum_10d'] = ((df['Close'].iloc[-1] / df['Close'].iloc[-10]) - 1) * 100 if len(df) >= 10 else 0
-            features['momentum_20d'] = ((df['Close'].iloc[-1] / df['Close'].iloc[-20]) - 1) * 100 if len(df) >= 20 else 0
-
-            # Volatility (standard deviation)
-            features['volatility'] = df['Close'].pct_change().rolling(window=20).std().iloc[-1] * 100 if len(df) >= 20 else 0
-
-            # 3. Finnhub real-time data
-            quote = self.finnhub.get_quote(ticker)
-            if quote:
-                features['current_price'] = quote.get('c', 0)
-                features['daily_change'] = ((quote.get('c', 0) / quote.get('pc', 1)) - 1) * 100 if quote.get('pc', 0) > 0 else 0
-                features['intraday_range'] = ((quote.get('h', 0) - quote.get('l', 1)) / quote.get('l', 1)) * 100 if quote.get('l', 0) > 0 else 0
-            else:
-                features['current_price'] = df['Close'].iloc[-1]
-                features['daily_change'] = 0
-                features['intraday_range'] = 0
-
-            # Analyst data
-            price_target = self.finnhub.get_price_target(ticker)
-            if price_target:
-                target_mean = price_target.get('targetMean', 0)
-                if target_mean > 0 and features['current_price'] > 0:
-                    features['upside_potential'] = ((target_mean / features['current_price']) - 1) * 100
-                else:
-                    features['upside_potential'] = 0
-            else:
-                features['upside_potential'] = 0
-
-            # 4. Reddit sentiment
-            features['reddit_mentions'] = 0
-            features['reddit_sentiment_score'] = 0
-
-            try:
-                trending = self.reddit.get_trending_stocks(limit=50, hours=24)
-                for stock in trending:
-                    if stock['ticker'] == ticker:
-                        features['reddit_mentions'] = stock['mentions']
-                        features['reddit_sentiment_score'] = stock['sentimentScore']
-                        break
-            except Exception as e:
-                logger.warning(f"Reddit sentiment unavailable for {ticker}: {str(e)}")
-
-            # 5. News impact
-            features['news_count_7d'] = 0
-            features['has_news_bomb'] = 0
-
-            try:
-                company_news = self.news.get_stock_news(ticker, days=7)
-                features['news_count_7d'] = len(company_news)
-
-                # Check for news bombs (high-impact keywords)
-                news_bombs = self.news.get_news_bombs(limit=20)
-                for bomb in news_bombs:
-                    if ticker.upper() in bomb.get('title', '').upper():
-                        features['has_news_bomb'] = 1
-                        break
-            except Exception as e:
-                logger.warning(f"News data unavailable for {ticker}: {str(e)}")
+            quote, price_target, company_news = (future.result() for future in futures[1:])
+            if trending is None or news_bombs is None:
+                shared_trending, shared_bombs = self._fetch_shared_signals()
+                trending = shared_trending if trending is None else trending
+                news_bombs = shared_bombs if news_bombs is None else news_bombs
 
-            return features
+            return self._build_features(
+                ticker, hist, quote, price_target, trending, company_news, news_bombs
+            )
 
         except Exception as e:
             logger.error(f"Error extracting features for {ticker}: {str(e)}")
             return None
 
-    def _calculate_technical_score(self, features: Dict) -> float:
-        """Calculate technical analysis score (0-1)"""
-        score = 0.0
-
-        # RSI - oversold (< 30) is bullish, overbought (> 70) is bearish
-        rsi = features.get('rsi', 50)
-        if rsi < 30:
-            score += 0.3  # Strong oversold signal
-        elif rsi < 45:
-            score += 0.15  # Moderate oversold
-        elif rsi > 70:
-            score -= 0.2  # Overbought warning
-
-        # MACD - positive histogram and above signal line is bullish
-        macd_hist = features.get('macd_histogram', 0)
-        if macd_hist > 0:
-            score += 0.2
-
-        # Bollinger Bands - near lower band is potential reversal
-        bb_pos = features.get('bb_position', 0.5)
-        if bb_pos < 0.2:
-            score += 0.2  # Near lower band
-        elif bb_pos > 0.8:
-            score -= 0.1  # Near upper band
-
-        # Volume surge - 2x+ average volume is strong signal
-        vol_ratio = features.get('volume_ratio', 1.0)
-        if vol_ratio > 2.0:
-            score += 0.3
-        elif vol_ratio > 1.5:
-            score += 0.15
-
-        # Momentum - positive recent momentum
-        momentum_5d = features.get('momentum_5d', 0)
-        if momentum_5d > 5:
-            score += 0.2
-        elif momentum_5d > 2:
-            score += 0.1
-        elif momentum_5d < -5:
-            score -= 0.2
-
-        return max(0.0, min(1.0, score))
-
-    def _calculate_sentiment_score(self, features: Dict) -> float:
-        """Calculate social sentiment score (0-1)"""
-        score = 0.5  # Neutral baseline
-
-        # Reddit mentions (more = more interest)
-        mentions = features.get('reddit_mentions', 0)
-        if mentions > 20:
-            score += 0.3  # Viral
-        elif mentions > 10:
-            score += 0.2  # Trending
-        elif mentions > 5:
-            score += 0.1  # Notable
-
-        # Reddit sentiment
-        sentiment = features.get('reddit_sentiment_score', 0)
-        if sentiment > 2.0:
-            score += 0.3  # Very bullish
-        elif sentiment > 1.0:
-            score += 0.2  # Bullish
-        elif sentiment < -1.0:
-            score -= 0.2  # Bearish
-
-        return max(0.0, min(1.0, score))
-
-    def _calculate_news_score(self, features: Dict) -> float:
-        """Calculate news impact score (0-1)"""
-        score = 0.5  # Neutral baseline
-
-        # News bomb (high-impact event)
-        if features.get('has_news_bomb', 0) == 1:
-            score += 0.4
-
-        # Recent news volume
-        news_count = features.get('news_count_7d', 0)
-        if news_count > 10:
-            score += 0.2
-        elif news_count > 5:
-            score += 0.1
-
-        return max(0.0, min(1.0, score))
-
-    def _calculate_fundamental_score(self, features: Dict) -> float:
-        """Calculate fundamental analysis score (0-1)"""
-        score = 0.5  # Neutral baseline
-
-        # Analyst upside potential
-        upside = features.get('upside_potential', 0)
-        if upside > 20:
-            score += 0.3
-        elif upside > 10:
-            score += 0.2
-        elif upside > 5:
-            score += 0.1
-        elif upside < -10:
-            score -= 0.2
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _build_features(
+        self,
+        ticker: str,
+        hist: pd.DataFrame,
+        quote: Optional[Dict],
+        price_target: Optional[Dict],
+        trending: List[Dict],
+        company_news: Optional[List[Dict]],
+        news_bombs: List[Dict]
+    ) -> Dict:
+        """Compute the feature dict from already-fetched source data"""
+        features = {}
 
-        # Daily change momentum
-        daily_change = features.get('daily_change', 0)
-        if daily_change > 3:
-            score += 0.2
-        elif daily_change > 1:
-            score += 0.1
-        elif daily_change < -3:
-            score -= 0.2
-
-        return max(0.0, min(1.0, score))
-
-    def _predict_with_model(self, features: Dict) -> float:
-        """Use trained XGBoost model for prediction"""
+        # 2. Technical Indicators (read-only on hist, so no copy is needed)
+        close_series = hist['Close']
+
+        # Raw arrays for scalar lookups (avoids pandas dispatch per access)
+        close = close_series.to_numpy(dtype=float)
+        volume = hist['Volume'].to_numpy(dtype=float)
+        n = close.size
+
+        # RSI (Relative Strength Index)
+        rsi_series = _calculate_rsi(close_series, length=14)
+        rsi_value = rsi_series.iloc[-1] if not rsi_series.empty else None
+        if rsi_value is None or not np.isfinite(rsi_value):
+            rsi_value = 50
+        features['rsi'] = float(rsi_value)
+
+        # MACD (Moving Average Convergence Divergence)
+        macd_line, macd_signal, macd_hist = _calculate_macd(close_series)
+        if not macd_line.empty:
+            macd_value = macd_line.iloc[-1]
+            macd_signal_value = macd_signal.iloc[-1] if not macd_signal.empty else None
+            macd_hist_value = macd_hist.iloc[-1] if not macd_hist.empty else None
+            features['macd'] = float(macd_value) if np.isfinite(macd_value) else 0.0
+            features['macd_signal'] = float(macd_signal_value) if macd_signal_value is not None and np.isfinite(macd_signal_value) else 0.0
+            features['macd_histogram'] = float(macd_hist_value) if macd_hist_value is not None and np.isfinite(macd_hist_value) else 0.0
+        else:
+            features['macd'] = 0.0
+            features['macd_signal'] = 0.0
+            features['macd_histogram'] = 0.0
+
+        # Bollinger Bands
+        bb_lower, bb_mid, bb_upper = _calculate_bbands(close_series, length=20, std=2.0)
+        bb_position = 0.5
+        if not bb_lower.empty and not bb_upper.empty:
+            lower = bb_lower.iloc[-1]
+            upper = bb_upper.iloc[-1]
+            current_price = close[-1]
+            if np.isfinite(lower) and np.isfinite(upper) and np.isfinite(current_price) and upper != lower:
+                bb_position = (current_price - lower) / (upper - lower)
+        features['bb_position'] = float(bb_position)
+
+        # Volume analysis
+        avg_volume = volume[-20:].mean()
+        current_volume = volume[-1]
+        features['volume_ratio'] = float(current_volume / avg_volume) if avg_volume > 0 else 1.0
+
+        # Price momentum (% change)
+        features['momentum_5d'] = float((close[-1] / close[-5] - 1) * 100) if n >= 5 else 0
+        features['momentum_10d'] = float((close[-1] / close[-10] - 1) * 100) if n >= 10 else 0
+        features['momentum_20d'] = float((close[-1] / close[-20] - 1) * 100) if n >= 20 else 0
+
+        # Volatility (standard deviation of the last 20 daily returns)
+        window = close[-21:]
+        returns = np.diff(window) / window[:-1]
+        features['volatility'] = float(returns.std(ddof=1) * 100) if n >= 20 else 0
+
+        # 3. Finnhub real-time data
+        if quote:
+            features['current_price'] = quote.get('c', 0)
+            features['daily_change'] = ((quote.get('c', 0) / quote.get('pc', 1)) - 1) * 100 if quote.get('pc', 0) > 0 else 0
+            features['intraday_range'] = ((quote.get('h', 0) - quote.get('l', 1)) / quote.get('l', 1)) * 100 if quote.get('l', 0) > 0 else 0
+        else:
+            features['current_price'] = float(close[-1])
+            features['daily_change'] = 0
+            features['intraday_range'] = 0
+
+        # Analyst data
+        if price_target:
+            target_mean = price_target.get('targetMean', 0)
+            if target_mean > 0 and features['current_price'] > 0:
+                features['upside_potential'] = ((target_mean / features['current_price']) - 1) * 100
+            else:
+                features['upside_potential'] = 0
+        else:
+            features['upside_potential'] = 0
+
+        # 4. Reddit sentiment
+        features['reddit_mentions'] = 0
+        features['reddit_sentiment_score'] = 0
+
+        for stock in trending:
+            if stock['ticker'] == ticker:
+                features['reddit_mentions'] = stock['mentions']
+                features['reddit_sentiment_score'] = stock['sentimentScore']
+                break
+
+        # 5. News impact
+        features['news_count_7d'] = len(company_news) if company_news is not None else 0
+        features['has_news_bomb'] = 0
+
+        # Check for news bombs (high-impact keywords)
+        for bomb in news_bombs:
+            if ticker.upper() in bomb.get('title', '').upper():
+                features['has_news_bomb'] = 1
+                break
+
+        return features
+
+    def _set_feature_names(self, names: List[str]):
+        """Store model feature order and the lookup used to build input rows"""
+        self.feature_names = list(names)
+        self._feature_getter = itemgetter(*self.feature_names) if self.feature_names else None
+        self._feature_defaults = dict.fromkeys(self.feature_names, 0.0)
+
+    def _predict_batch(self, features_list: List[Dict]) -> np.ndarray:
+        """Use trained XGBoost model to score many feature dicts in one call"""
         try:
-            # Convert features to array in correct order
-            feature_vector = [features.get(name, 0) for name in self.feature_names]
-            feature_vector = np.array(feature_vector).reshape(1, -1)
-
-            # Scale features
-            feature_vector_scaled = self.scaler.transform(feature_vector)
-
-            # Predict probability
-            dmatrix = xgb.DMatrix(feature_vector_scaled, feature_names=self.feature_names)
-            prediction = self.model.predict(dmatrix)[0]
-
-            return float(prediction)
+            # Convert features to matrix in correct order. Extracted feature
+            # dicts normally carry every model feature, so the getter runs
+            # directly; only rows missing a name are padded with 0.0
+            getter = self._feature_getter
+            rows = []
+            for features in features_list:
+                try:
+                    rows.append(getter(features))
+                except KeyError:
+                    rows.append(getter({**self._feature_defaults, **features}))
+            X = np.asarray(rows, dtype=np.float32).reshape(len(features_list), len(self.feature_names))
+
+            # Scale features (float32 in, float32 out for XGBoost)
+            X_scaled = (X - self.scaler_mean) / self.scaler_scale
+
+            # Predict probabilities in-process, no DMatrix construction
+            return np.asarray(self.model.inplace_predict(X_scaled), dtype=float)
 
         except Exception as e:
             logger.error(f"Error in model prediction: {str(e)}")
-            return 0.5
+            return np.full(len(features_list), 0.5)
 
     def train_model(self, tickers: List[str], lookback_days: int = 730):
         """
@@ -424,164 +739,109 @@ class MLStockPredictor:
             tickers: List of stock symbols to train on
             lookback_days: How many days of history to use (default 2 years)
         """
-        logger.info(f"Training model on {len(tickers)} stocks with {lookback_days} days history")
-
-        training_data = []
-
-        for ticker in tickers:
-            try:
-                logger.info(f"Collecting training data for {ticker}")
-
-                # Get historical data
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period=f'{lookback_days}d')
-
-                if len(hist) < 50:
-                    continue
-
-                # For each date, extract features and label
-                for i in range(20, len(hist) - 7):  # Need 20 days for indicators, 7 days for label
-                    date = hist.index[i]
-                    future_date = hist.index[i + 7] if i + 7 < len(hist) else None
-
-                    if not future_date:
-                        continue
-
-                    # Get price at current date and 7 days later
-                    current_price = hist['Close'].iloc[i]
-                    future_price = hist['Close'].iloc[i + 7]
-
-                    # Label: 1 if stock rose 10%+ in next 7 days, 0 otherwise
-                    label = 1 if (future_price / current_price - 1) >= 0.10 else 0
-
-                    # Extract features for this date (using data up to this point)
-                    features = self._extract_historical_features(hist.iloc[:i+1])
-
-                    if features:
-                        features['label'] = label
-                        features['ticker'] = ticker
-                        training_data.append(features)
-
-            except Exception as e:
-                logger.error(f"Error collecting data for {ticker}: {str(e)}")
-                continue
-
-        if len(training_data) < 100:
-            logger.error("Not enough training data collected")
-            return
-
-        # Convert to DataFrame
-        df = pd.DataFrame(training_data)
-        logger.info(f"Collected {len(df)} training samples")
+        import xgboost as xgb
+        from sklearn.preprocessing import StandardScaler
 
-        # Separate features and labels
-        X = df.drop(['label', 'ticker'], axis=1)
-        y = df['label']
-
-        # Store feature names
-        self.feature_names = list(X.columns)
-
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
-
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X_scaled, y, test_size=0.2, random_state=42
-        )
-
-        # Train XGBoost model
-        logger.info("Training XGBoost model...")
+        logger.info(f"Training model on {len(tickers)} stocks with {lookback_days} days history")
 
-        dtrain = xgb.DMatrix(X_train, label=y_train, feature_names=self.feature_names)
-        dtest = xgb.DMatrix(X_test, label=y_test, feature_names=self.feature_names)
+        # Shards keep peak memory flat: rows go to disk per ticker and are
+        # streamed back into XGBoost batch by batch
+        with tempfile.TemporaryDirectory(prefix='ml_training_') as shard_dir:
+            shard_files = []
+            total_rows = 0
+
+            # Indicator recomputation is CPU bound, so fan tickers out to processes
+            workers = max(1, min(len(tickers), os.cpu_count() or 1))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                shards = executor.map(_write_training_shard, tickers, repeat(lookback_days), repeat(shard_dir))
+                for path, rows in shards:
+                    if path:
+                        shard_files.append(path)
+                        total_rows += rows
+
+            if total_rows < 100:
+                logger.error("Not enough training data collected")
+                return
+
+            logger.info(f"Collected {total_rows} training samples")
+
+            # Store feature names
+            self._set_feature_names(FEATURE_NAMES)
+
+            # Fit the scaler incrementally, one shard at a time
+            scaler = StandardScaler()
+            for path in shard_files:
+                scaler.partial_fit(_load_training_shard(path)[0])
+            self.scaler_mean = scaler.mean_.astype(np.float32)
+            self.scaler_scale = scaler.scale_.astype(np.float32)
+
+            # Train XGBoost model
+            logger.info("Training XGBoost model...")
+
+            # Quantile matrices are built from the shard iterators; XGBoost
+            # versions with external-memory support spill them to disk too
+            matrix_type = getattr(xgb, 'ExtMemQuantileDMatrix', None)
+            cache_prefix = os.path.join(shard_dir, 'xgb_cache') if matrix_type else None
+            matrix_type = matrix_type or xgb.QuantileDMatrix
+
+            train_iter = _shard_iterator(
+                shard_files, self.scaler_mean, self.scaler_scale, self.feature_names,
+                test=False, cache_prefix=cache_prefix
+            )
+            test_iter = _shard_iterator(
+                shard_files, self.scaler_mean, self.scaler_scale, self.feature_names,
+                test=True, cache_prefix=cache_prefix and cache_prefix + '_test'
+            )
+            dtrain = matrix_type(train_iter, max_bin=self.MAX_BIN)
+            dtest = matrix_type(test_iter, ref=dtrain)
+
+            params = {
+                'objective': 'binary:logistic',
+                'max_depth': 6,
+                'learning_rate': 0.1,
+                'eval_metric': 'logloss',
+                'tree_method': 'hist',
+                'max_bin': self.MAX_BIN,
+                'nthread': os.cpu_count() or 1,
+                'device': 'cuda' if _have_cuda() else 'cpu'
+            }
 
-        params = {
-            'objective': 'binary:logistic',
-            'max_depth': 6,
-            'learning_rate': 0.1,
-            'n_estimators': 100,
-            'eval_metric': 'logloss'
-        }
+            evals = [(dtrain, 'train'), (dtest, 'test')]
+            self.model = xgb.train(
+                params,
+                dtrain,
+                num_boost_round=100,
+                evals=evals,
+                early_stopping_rounds=10,
+                verbose_eval=10
+            )
 
-        evals = [(dtrain, 'train'), (dtest, 'test')]
-        self.model = xgb.train(
-            params,
-            dtrain,
-            num_boost_round=100,
-            evals=evals,
-            early_stopping_rounds=10,
-            verbose_eval=10
-        )
+            # Evaluate
+            y_test = dtest.get_label()
+            y_pred = self.model.predict(dtest)
+            y_pred_binary = (y_pred > 0.5).astype(int)
 
-        # Evaluate
-        y_pred = self.model.predict(dtest)
-        y_pred_binary = (y_pred > 0.5).astype(int)
+            accuracy = (y_pred_binary == y_test).mean()
+            logger.info(f"Model accuracy: {accuracy:.2%}")
 
-        accuracy = (y_pred_binary == y_test).mean()
-        logger.info(f"Model accuracy: {accuracy:.2%}")
+            # Release the matrices (and their disk caches) before the shard dir goes away
+            del evals, dtrain, dtest
 
         # Save model
         self._save_model()
 
         logger.info("Model training complete!")
 
-    def _extract_historical_features(self, hist: pd.DataFrame) -> Optional[Dict]:
-        """Extract features from historical data slice"""
-        try:
-            if len(hist) < 20:
-                return None
-
-            features = {}
-            df = hist.copy()
-
-            # Technical indicators
-            rsi_series = _calculate_rsi(df['Close'], length=14)
-            rsi_value = rsi_series.iloc[-1] if not rsi_series.empty else None
-            if rsi_value is None or not np.isfinite(rsi_value):
-                rsi_value = 50
-            features['rsi'] = float(rsi_value)
-
-            macd_line, macd_signal, macd_hist = _calculate_macd(df['Close'])
-            if not macd_line.empty:
-                macd_value = macd_line.iloc[-1]
-                macd_signal_value = macd_signal.iloc[-1] if not macd_signal.empty else None
-                macd_hist_value = macd_hist.iloc[-1] if not macd_hist.empty else None
-                features['macd'] = float(macd_value) if np.isfinite(macd_value) else 0.0
-                features['macd_signal'] = float(macd_signal_value) if macd_signal_value is not None and np.isfinite(macd_signal_value) else 0.0
-                features['macd_histogram'] = float(macd_hist_value) if macd_hist_value is not None and np.isfinite(macd_hist_value) else 0.0
-            else:
-                features['macd'] = 0.0
-                features['macd_signal'] = 0.0
-                features['macd_histogram'] = 0.0
-
-            # Volume
-            avg_volume = df['Volume'].rolling(window=20).mean().iloc[-1]
-            current_volume = df['Volume'].iloc[-1]
-            features['volume_ratio'] = current_volume / avg_volume if avg_volume > 0 else 1.0
-
-            # Momentum
-            features['momentum_5d'] = ((df['Close'].iloc[-1] / df['Close'].iloc[-5]) - 1) * 100 if len(df) >= 5 else 0
-            features['momentum_10d'] = ((df['Close'].iloc[-1] / df['Close'].iloc[-10]) - 1) * 100 if len(df) >= 10 else 0
-
-            # Volatility
-            features['volatility'] = df['Close'].pct_change().rolling(window=20).std().iloc[-1] * 100
-
-            return features
-
-        except Exception as e:
-            return None
-
     def _save_model(self):
         """Save model and scaler to disk"""
         try:
             model_file = self.model_path / 'xgboost_model.json'
-            scaler_file = self.model_path / 'scaler.pkl'
+            scaler_file = self.model_path / 'scaler.npz'
             features_file = self.model_path / 'feature_names.pkl'
 
             self.model.save_model(str(model_file))
 
-            with open(scaler_file, 'wb') as f:
-                pickle.dump(self.scaler, f)
+            np.savez(scaler_file, mean=self.scaler_mean, scale=self.scaler_scale)
 
             with open(features_file, 'wb') as f:
                 pickle.dump(self.feature_names, f)
@@ -595,18 +855,30 @@ class MLStockPredictor:
         """Load model and scaler from disk"""
         try:
             model_file = self.model_path / 'xgboost_model.json'
-            scaler_file = self.model_path / 'scaler.pkl'
+            scaler_file = self.model_path / 'scaler.npz'
+            legacy_scaler_file = self.model_path / 'scaler.pkl'
             features_file = self.model_path / 'feature_names.pkl'
 
-            if model_file.exists() and scaler_file.exists() and features_file.exists():
+            has_scaler = scaler_file.exists() or legacy_scaler_file.exists()
+            if model_file.exists() and has_scaler and features_file.exists():
+                import xgboost as xgb
+
                 self.model = xgb.Booster()
                 self.model.load_model(str(model_file))
 
-                with open(scaler_file, 'rb') as f:
-                    self.scaler = pickle.load(f)
+                if scaler_file.exists():
+                    with np.load(scaler_file) as arrays:
+                        mean, scale = arrays['mean'], arrays['scale']
+                else:
+                    # Models saved before scaler.npz pickled the whole StandardScaler
+                    with open(legacy_scaler_file, 'rb') as f:
+                        legacy_scaler = pickle.load(f)
+                    mean, scale = legacy_scaler.mean_, legacy_scaler.scale_
+                self.scaler_mean = np.asarray(mean, dtype=np.float32)
+                self.scaler_scale = np.asarray(scale, dtype=np.float32)
 
                 with open(features_file, 'rb') as f:
-                    self.feature_names = pickle.load(f)
+                    self._set_feature_names(pickle.load(f))
 
                 logger.info("Model loaded successfully")
             else:
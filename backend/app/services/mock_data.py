@@ -6,12 +6,14 @@ Provides realistic mock data for testing and demo purposes.
 Used when Yahoo Finance API is rate-limited or for development.
 """
 
-from typing import List, Dict
-from datetime import datetime, timedelta
+from typing import List, Dict, Tuple
 import random
+import sys
+
+import numpy as np
 
 # S&P 500 Top 250 Stocks
-SP500_TOP_250 = [
+SP500_TOP_250 = (
     "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "BRK.B", "UNH", "JNJ",
     "V", "XOM", "WMT", "JPM", "MA", "PG", "LLY", "CVX", "HD", "MRK",
     "ABBV", "KO", "AVGO", "PEP", "COST", "TMO", "ADBE", "MCD", "CSCO", "ACN",
@@ -37,10 +39,10 @@ SP500_TOP_250 = [
     "DD", "FTNT", "GEHC", "SBAC", "AWK", "HLT", "TTWO", "WAB", "CSGP", "MPWR",
     "EIX", "IT", "ON", "EXR", "ANSS", "MLM", "IR", "DFS", "LYB", "VICI",
     "ZBH", "FANG", "EBAY", "RMD", "WEC", "STT", "HPQ", "ENPH", "ROK", "TSCO"
-]
+)
 
 # NASDAQ Top 250 Stocks
-NASDAQ_TOP_250 = [
+NASDAQ_TOP_250 = (
     "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "AVGO", "COST", "NFLX",
     "ADBE", "CSCO", "PEP", "CMCSA", "TMO", "INTC", "TXN", "QCOM", "HON", "AMD",
     "INTU", "AMAT", "ISRG", "BKNG", "ADI", "VRTX", "REGN", "LRCX", "GILD", "MDLZ",
@@ -66,235 +68,285 @@ NASDAQ_TOP_250 = [
     "NET", "ZS", "OKTA", "PANW", "FTNT", "CYBR", "TENB", "RPD", "QLYS", "VRNS",
     "GTLB", "IOT", "PATH", "NCNO", "YEXT", "BLKB", "JAMF", "YOU", "APPF", "APPS",
     "ZUO", "BILL", "TOST", "SQ", "SHOP", "WIX", "BIGC", "SSTK", "ETSY", "W"
-]
+)
+
+# Combined, deduplicated universe (order preserved), built once at import.
+# Interning lets tickers shared by both indexes compare by identity.
+_UNIVERSE: tuple = tuple(sys.intern(t) for t in dict.fromkeys(SP500_TOP_250 + NASDAQ_TOP_250))
+
+# Shared generator so each call draws its randomness in a few batched calls
+_RNG = np.random.default_rng()
+
+
+def _choice(options):
+    """Pick one element of ``options`` using the shared generator."""
+    return options[_RNG.integers(len(options))]
+
+
+# Target price multiplier range per timeframe ("long" is the fallback)
+_TARGET_MULTIPLIERS = {"day": (1.01, 1.03), "swing": (1.05, 1.15)}
+_LONG_TARGET_MULTIPLIER = (1.15, 1.30)
+
+# Risk level by total score: <= 65 HIGH, <= 75 MEDIUM, above that LOW
+_RISK_THRESHOLDS = (65, 75)
+_RISK_LEVELS = ("HIGH", "MEDIUM", "LOW")
+
+# Reasoning phrases per score component, indexed by tier (0 = not notable)
+_TECHNICAL_REASONS = ("", "favorable technical setup", "strong technical breakout pattern")
+_MOMENTUM_REASONS = ("", "positive momentum trend", "exceptional price momentum")
+_VOLUME_REASONS = ("", "above-average trading volume", "significant volume surge")
+_TREND_REASONS = ("", "emerging upward trend", "confirmed uptrend")
+_REASON_PHRASES = (_TECHNICAL_REASONS, _MOMENTUM_REASONS, _VOLUME_REASONS, _TREND_REASONS)
+
+# Technical signals and the probability each one fires for a pick
+_SIGNAL_NAMES = ("Above SMA 20", "Above SMA 50", "RSI Neutral", "MACD Bullish", "High Volume")
+_SIGNAL_PROBS = np.array([0.7, 0.6, 0.5, 0.6, 0.4])
+
+# Key layout shared by every stock pick; copied per pick, then filled in
+_PICK_TEMPLATE = {
+    "rank": 0,
+    "ticker": "",
+    "sector": "",
+    "score": 0.0,
+    "currentPrice": 0.0,
+    "targetPrice": 0.0,
+    "potentialReturn": 0.0,
+    "confidence": 0,
+    "timeHorizon": "",
+    "reasoning": "",
+    "signals": None,
+    "riskLevel": "",
+    "breakdown": None,
+    "fundamentals": None,
+}
+
+# Static parts of the macro indicators payload; None leaves are drawn per call
+_MACRO_SKELETON = {
+    "gdp": {"value": None, "change": None, "trend": "stable", "impact": "NEUTRAL"},
+    "unemployment": {"value": None, "change": None, "trend": "stable", "impact": "NEUTRAL"},
+    "inflation": {"value": None, "change": None, "trend": "declining", "impact": "POSITIVE"},
+    "interestRate": {"value": None, "change": 0.0, "trend": "stable", "impact": "NEUTRAL"},
+    "marketSentiment": {"value": None, "vix": None, "trend": "improving", "impact": "POSITIVE"},
+}
+
+# (indicator, field, low, high, decimals) for each random macro leaf
+_MACRO_RANGES = (
+    ("gdp", "value", 2.0, 4.0, 1),
+    ("gdp", "change", -0.5, 0.5, 1),
+    ("unemployment", "value", 3.5, 5.0, 1),
+    ("unemployment", "change", -0.3, 0.3, 1),
+    ("inflation", "value", 2.0, 4.5, 1),
+    ("inflation", "change", -0.5, 0.5, 1),
+    ("interestRate", "value", 4.5, 5.5, 2),
+    ("marketSentiment", "vix", 12, 20, 2),
+)
+_MACRO_LOW = np.array([r[2] for r in _MACRO_RANGES])
+_MACRO_HIGH = np.array([r[3] for r in _MACRO_RANGES])
+_MARKET_SENTIMENTS = ("BULLISH", "NEUTRAL", "CAUTIOUS")
+
+# Focus on smaller cap growth stocks
+_GEM_TICKERS = (
+    "SNOW", "DDOG", "NET", "CRWD", "ZS", "OKTA", "MDB", "ESTC",
+    "SOUN", "IONQ", "RXRX", "DNA", "PACB", "BILL", "FOUR", "TENB",
+    "ASAN", "IOT", "TOST", "PATH", "FRSH", "FROG", "DOCN", "GTLB"
+)
+
+# High volatility stocks good for day/swing trading
+_QUICK_WIN_TICKERS = (
+    "NVDA", "TSLA", "AMD", "COIN", "MRNA", "PLTR", "RIVN", "LCID",
+    "NIO", "MARA", "RIOT", "SMCI", "ARM", "SNOW", "CRWD"
+)
+
+
+def _build_picks(universe: tuple, scores: np.ndarray, base_range: Tuple[float, float],
+                 target_range: Tuple[float, float], assembler) -> List[Dict]:
+    """Shared skeleton of the mock pick generators.
+
+    Samples one ticker per score from ``universe``, draws current prices and
+    target multipliers, rounds the shared fields once, then builds each pick
+    with ``assembler(i, ticker, score, price, target, potential_return, confidence)``.
+    """
+    n = len(scores)
+    tickers = random.sample(universe, n)
+
+    base = _RNG.uniform(*base_range, n)
+    target = base * _RNG.uniform(*target_range, n)
+    returns = ((target - base) / base) * 100
+
+    score = np.round(scores, 1).tolist()
+    confidence = scores.astype(np.int32).tolist()
+    base, target, returns = (np.round(arr, 2).tolist() for arr in (base, target, returns))
+
+    return [
+        assembler(i, ticker, score[i], base[i], target[i], returns[i], confidence[i])
+        for i, ticker in enumerate(tickers)
+    ]
+
+
+def _pick_numerics(n: int) -> Tuple[np.ndarray, ...]:
+    """Draw and aggregate the score components for ``n`` stock picks in one pass.
+
+    Returns (technical, momentum, volume, trend, total, risk, reason_tiers)
+    as arrays of length ``n``.
+    """
+    # Generate realistic scoring for every pick at once
+    technical = _RNG.uniform(18, 30, n)
+    momentum = _RNG.uniform(18, 30, n)
+    volume = _RNG.uniform(12, 20, n)
+    trend = _RNG.uniform(12, 20, n)
+    total = technical + momentum + volume + trend
+
+    # Determine risk levels (right=True keeps the strict "score > threshold" cut-offs)
+    risk = np.digitize(total, _RISK_THRESHOLDS, right=True)
+
+    # Reasoning tier per component, matching the "score > threshold" ladders
+    reason_tiers = np.column_stack([
+        np.digitize(technical, (20, 24), right=True),
+        np.digitize(momentum, (20, 24), right=True),
+        np.digitize(volume, (13, 16), right=True),
+        np.digitize(trend, (13, 16), right=True),
+    ])
+
+    return technical, momentum, volume, trend, total, risk, reason_tiers
+
 
 def get_mock_stock_picks(limit: int = 10, timeframe: str = "swing") -> List[Dict]:
     """Generate realistic mock stock picks"""
 
-    # Combine and deduplicate stocks
-    all_stocks = list(set(SP500_TOP_250 + NASDAQ_TOP_250))
-    random.shuffle(all_stocks)
-
-    picks = []
-    base_date = datetime.now()
+    n = min(limit, len(_UNIVERSE))
 
     # Define sectors for variety
     sectors = ["Technology", "Healthcare", "Finance", "Consumer", "Energy", "Industrial"]
-
-    for i, ticker in enumerate(all_stocks[:limit]):
-        # Generate realistic scoring
-        technical_score = random.uniform(18, 30)
-        momentum_score = random.uniform(18, 30)
-        volume_score = random.uniform(12, 20)
-        trend_score = random.uniform(12, 20)
-        total_score = technical_score + momentum_score + volume_score + trend_score
-
-        # Generate realistic prices
-        base_price = random.uniform(20, 500)
-
-        # Calculate targets based on timeframe
-        if timeframe == "day":
-            target_multiplier = random.uniform(1.01, 1.03)
-        elif timeframe == "swing":
-            target_multiplier = random.uniform(1.05, 1.15)
-        else:  # long
-            target_multiplier = random.uniform(1.15, 1.30)
-
-        target_price = base_price * target_multiplier
-        potential_return = ((target_price - base_price) / base_price) * 100
-
-        # Generate realistic reasoning
+    sector_picks = [sectors[j] for j in _RNG.integers(len(sectors), size=n).tolist()]
+    time_horizon = timeframe.upper()
+
+    technical, momentum, volume, trend, total, risk, reason_tiers = _pick_numerics(n)
+    risk, reason_tiers = risk.tolist(), reason_tiers.tolist()
+
+    # Roll every signal for every pick in one draw
+    signal_mask = (_RNG.random((n, len(_SIGNAL_NAMES))) < _SIGNAL_PROBS).tolist()
+
+    # Round whole columns once and hand Python floats to the dict assembly
+    technical, momentum, volume, trend = (
+        np.round(arr, 1).tolist() for arr in (technical, momentum, volume, trend)
+    )
+
+    # Generate fundamentals; roughly 30% of picks pay no dividend
+    market_cap = (_RNG.integers(10, 3001, n) * 1e9).tolist()
+    pe_ratio = np.round(_RNG.uniform(10, 40, n), 2).tolist()
+    dividend_yield = np.round(_RNG.uniform(0, 4, n), 2).tolist()
+    pays_dividend = (_RNG.random(n) > 0.3).tolist()
+    beta = np.round(_RNG.uniform(0.8, 1.5, n), 2).tolist()
+    revenue_growth = np.round(_RNG.uniform(-10, 50, n), 2).tolist()
+
+    def assemble(i, ticker, score, price, target, potential_return, confidence):
+        # Generate realistic reasoning from the first two notable components
         reasons = []
-        if technical_score > 24:
-            reasons.append("strong technical breakout pattern")
-        elif technical_score > 20:
-            reasons.append("favorable technical setup")
-
-        if momentum_score > 24:
-            reasons.append("exceptional price momentum")
-        elif momentum_score > 20:
-            reasons.append("positive momentum trend")
-
-        if volume_score > 16:
-            reasons.append("significant volume surge")
-        elif volume_score > 13:
-            reasons.append("above-average trading volume")
-
-        if trend_score > 16:
-            reasons.append("confirmed uptrend")
-        elif trend_score > 13:
-            reasons.append("emerging upward trend")
-
-        reasoning = f"Strong opportunity driven by {', '.join(reasons[:2])}"
-
-        # Generate signals
-        signals = []
-        if random.random() > 0.3:
-            signals.append("Above SMA 20")
-        if random.random() > 0.4:
-            signals.append("Above SMA 50")
-        if random.random() > 0.5:
-            signals.append("RSI Neutral")
-        if random.random() > 0.4:
-            signals.append("MACD Bullish")
-        if random.random() > 0.6:
-            signals.append("High Volume")
-
-        # Determine risk level
-        if total_score > 75:
-            risk_level = "LOW"
-        elif total_score > 65:
-            risk_level = "MEDIUM"
-        else:
-            risk_level = "HIGH"
-
-        pick = {
-            "rank": i + 1,
-            "ticker": ticker,
-            "sector": random.choice(sectors),
-            "score": round(total_score, 1),
-            "currentPrice": round(base_price, 2),
-            "targetPrice": round(target_price, 2),
-            "potentialReturn": round(potential_return, 2),
-            "confidence": int(total_score),
-            "timeHorizon": timeframe.upper(),
-            "reasoning": reasoning,
-            "signals": signals[:4],
-            "riskLevel": risk_level,
-            "breakdown": {
-                "technical": round(technical_score, 1),
-                "momentum": round(momentum_score, 1),
-                "volume": round(volume_score, 1),
-                "trend": round(trend_score, 1)
-            },
-            "fundamentals": {
-                "marketCap": random.randint(10, 3000) * 1e9,
-                "peRatio": round(random.uniform(10, 40), 2),
-                "dividendYield": round(random.uniform(0, 4), 2) if random.random() > 0.3 else None,
-                "beta": round(random.uniform(0.8, 1.5), 2),
-                "revenueGrowth": round(random.uniform(-10, 50), 2)
-            }
+        for phrases, tier in zip(_REASON_PHRASES, reason_tiers[i]):
+            if tier:
+                reasons.append(phrases[tier])
+                if len(reasons) == 2:
+                    break
+        reasoning = f"Strong opportunity driven by {', '.join(reasons)}"
+
+        signals = [name for name, hit in zip(_SIGNAL_NAMES, signal_mask[i]) if hit]
+
+        pick = _PICK_TEMPLATE.copy()
+        pick["rank"] = i + 1
+        pick["ticker"] = ticker
+        pick["sector"] = sector_picks[i]
+        pick["score"] = score
+        pick["currentPrice"] = price
+        pick["targetPrice"] = target
+        pick["potentialReturn"] = potential_return
+        pick["confidence"] = confidence
+        pick["timeHorizon"] = time_horizon
+        pick["reasoning"] = reasoning
+        pick["signals"] = signals[:4]
+        pick["riskLevel"] = _RISK_LEVELS[risk[i]]
+        pick["breakdown"] = {
+            "technical": technical[i],
+            "momentum": momentum[i],
+            "volume": volume[i],
+            "trend": trend[i]
         }
+        pick["fundamentals"] = {
+            "marketCap": market_cap[i],
+            "peRatio": pe_ratio[i],
+            "dividendYield": dividend_yield[i] if pays_dividend[i] else None,
+            "beta": beta[i],
+            "revenueGrowth": revenue_growth[i]
+        }
+        return pick
 
-        picks.append(pick)
-
-    return picks
+    target_range = _TARGET_MULTIPLIERS.get(timeframe, _LONG_TARGET_MULTIPLIER)
+    return _build_picks(_UNIVERSE, total, (20, 500), target_range, assemble)
 
 
 def get_mock_hidden_gems(limit: int = 10) -> List[Dict]:
     """Generate mock hidden gem stocks"""
 
-    # Focus on smaller cap growth stocks
-    gems = [
-        "SNOW", "DDOG", "NET", "CRWD", "ZS", "OKTA", "MDB", "ESTC",
-        "SOUN", "IONQ", "RXRX", "DNA", "PACB", "BILL", "FOUR", "TENB",
-        "ASAN", "IOT", "TOST", "PATH", "FRSH", "FROG", "DOCN", "GTLB"
-    ]
-
-    random.shuffle(gems)
-
-    picks = []
-    for i, ticker in enumerate(gems[:limit]):
-        score = random.uniform(70, 95)
-        base_price = random.uniform(15, 200)
-        target_price = base_price * random.uniform(1.20, 1.50)
-
-        pick = {
+    def assemble(i, ticker, score, price, target, potential_return, confidence):
+        return {
             "rank": i + 1,
             "ticker": ticker,
-            "score": round(score, 1),
-            "currentPrice": round(base_price, 2),
-            "targetPrice": round(target_price, 2),
-            "potentialReturn": round(((target_price - base_price) / base_price) * 100, 2),
-            "confidence": int(score),
-            "gemType": "UNDERVALUED" if random.random() > 0.5 else "HIGH_GROWTH",
-            "reasoning": f"Exceptional growth potential with {random.choice(['strong revenue acceleration', 'expanding margins', 'market share gains', 'innovative technology'])}",
+            "score": score,
+            "currentPrice": price,
+            "targetPrice": target,
+            "potentialReturn": potential_return,
+            "confidence": confidence,
+            "gemType": "UNDERVALUED" if _RNG.random() > 0.5 else "HIGH_GROWTH",
+            "reasoning": f"Exceptional growth potential with {_choice(['strong revenue acceleration', 'expanding margins', 'market share gains', 'innovative technology'])}",
             "catalysts": [
-                random.choice(["Earnings beat expected", "New product launch", "Partnership announced"]),
-                random.choice(["Institutional buying", "Market expansion", "Margin improvement"])
+                _choice(["Earnings beat expected", "New product launch", "Partnership announced"]),
+                _choice(["Institutional buying", "Market expansion", "Margin improvement"])
             ],
             "riskLevel": "MEDIUM",
-            "marketCap": random.randint(1, 50) * 1e9,
-            "analystCoverage": random.randint(3, 12)
+            "marketCap": float(_RNG.integers(1, 51)) * 1e9,
+            "analystCoverage": int(_RNG.integers(3, 13))
         }
-        picks.append(pick)
 
-    return picks
+    scores = _RNG.uniform(70, 95, min(limit, len(_GEM_TICKERS)))
+    return _build_picks(_GEM_TICKERS, scores, (15, 200), (1.20, 1.50), assemble)
 
 
 def get_mock_quick_wins(limit: int = 10) -> List[Dict]:
     """Generate mock quick win opportunities"""
 
-    # High volatility stocks good for day/swing trading
-    tickers = [
-        "NVDA", "TSLA", "AMD", "COIN", "MRNA", "PLTR", "RIVN", "LCID",
-        "NIO", "MARA", "RIOT", "SMCI", "ARM", "SNOW", "CRWD"
-    ]
-
-    random.shuffle(tickers)
-
-    picks = []
-    for i, ticker in enumerate(tickers[:limit]):
-        score = random.uniform(75, 95)
-        base_price = random.uniform(30, 300)
-        target_price = base_price * random.uniform(1.03, 1.08)
-
-        pick = {
+    def assemble(i, ticker, score, price, target, potential_return, confidence):
+        return {
             "rank": i + 1,
             "ticker": ticker,
-            "score": round(score, 1),
-            "currentPrice": round(base_price, 2),
-            "targetPrice": round(target_price, 2),
-            "potentialReturn": round(((target_price - base_price) / base_price) * 100, 2),
-            "timeframe": random.choice(["1-3 days", "3-7 days", "1-2 weeks"]),
-            "confidence": int(score),
-            "reasoning": random.choice([
+            "score": score,
+            "currentPrice": price,
+            "targetPrice": target,
+            "potentialReturn": potential_return,
+            "timeframe": _choice(["1-3 days", "3-7 days", "1-2 weeks"]),
+            "confidence": confidence,
+            "reasoning": _choice([
                 "Technical breakout with strong volume confirmation",
                 "Oversold bounce setup with bullish divergence",
                 "Gap fill opportunity with institutional support",
                 "Momentum continuation pattern forming"
             ]),
-            "entryZone": f"${round(base_price * 0.98, 2)}-${round(base_price * 1.02, 2)}",
-            "stopLoss": round(base_price * 0.95, 2),
-            "riskRewardRatio": round(random.uniform(2.5, 4.0), 1)
+            "entryZone": f"${round(price * 0.98, 2)}-${round(price * 1.02, 2)}",
+            "stopLoss": round(price * 0.95, 2),
+            "riskRewardRatio": round(_RNG.uniform(2.5, 4.0), 1)
         }
-        picks.append(pick)
 
-    return picks
+    scores = _RNG.uniform(75, 95, min(limit, len(_QUICK_WIN_TICKERS)))
+    return _build_picks(_QUICK_WIN_TICKERS, scores, (30, 300), (1.03, 1.08), assemble)
 
 
 def get_mock_macro_indicators() -> Dict:
     """Generate mock macro economic indicators"""
 
-    return {
-        "gdp": {
-            "value": round(random.uniform(2.0, 4.0), 1),
-            "change": round(random.uniform(-0.5, 0.5), 1),
-            "trend": "stable",
-            "impact": "NEUTRAL"
-        },
-        "unemployment": {
-            "value": round(random.uniform(3.5, 5.0), 1),
-            "change": round(random.uniform(-0.3, 0.3), 1),
-            "trend": "stable",
-            "impact": "NEUTRAL"
-        },
-        "inflation": {
-            "value": round(random.uniform(2.0, 4.5), 1),
-            "change": round(random.uniform(-0.5, 0.5), 1),
-            "trend": "declining",
-            "impact": "POSITIVE"
-        },
-        "interestRate": {
-            "value": round(random.uniform(4.5, 5.5), 2),
-            "change": 0.0,
-            "trend": "stable",
-            "impact": "NEUTRAL"
-        },
-        "marketSentiment": {
-            "value": random.choice(["BULLISH", "NEUTRAL", "CAUTIOUS"]),
-            "vix": round(random.uniform(12, 20), 2),
-            "trend": "improving",
-            "impact": "POSITIVE"
-        }
-    }
+    indicators = {name: dict(fields) for name, fields in _MACRO_SKELETON.items()}
+
+    # Draw every numeric leaf in one call, then patch it into the skeleton
+    values = _RNG.uniform(_MACRO_LOW, _MACRO_HIGH).tolist()
+    for (name, field, _, _, digits), value in zip(_MACRO_RANGES, values):
+        indicators[name][field] = round(value, digits)
+
+    indicators["marketSentiment"]["value"] = _choice(_MARKET_SENTIMENTS)
+    return indicators
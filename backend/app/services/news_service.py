@@ -8,9 +8,17 @@ Supports categorization by newest and most weighted news.
 """
 
 import os
+import re
+import heapq
 import logging
-from typing import List, Dict, Optional, Literal
+from bisect import bisect_left
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Optional, Literal, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from cachetools import TTLCache
 from newsapi import NewsApiClient
 from dotenv import load_dotenv
 
@@ -18,6 +26,320 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Common ticker patterns: $AAPL, (NASDAQ: AAPL), AAPL stock
+_TICKER_RE = re.compile(
+    r'\$(?P<dollar>[A-Z]{1,5})\b'
+    r'|\((?:NASDAQ|NYSE|AMEX):\s*(?P<exch>[A-Z]{1,5})\)'
+    r'|\b(?P<suf>[A-Z]{2,5})\s+(?:stock|shares|inc|corp)'
+)
+
+# Shared pool for NewsAPI requests. Pooled tasks never submit to it
+# themselves, so waiting on its futures cannot deadlock
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="news")
+
+# Targeted search queries to get STOCK-RELATED news bombs only
+_BOMB_QUERIES = (
+    'stock acquisition OR stock merger',
+    'stock earnings beat OR earnings miss',
+    'FDA approval stock',
+    'IPO stock market',
+    'stock bankruptcy OR stock buyout'
+)
+_BOMB_DOMAINS = 'reuters.com,bloomberg.com,cnbc.com,marketwatch.com,wsj.com,finance.yahoo.com,seekingalpha.com'
+
+# Sports keywords to filter out of ticker-specific news
+_SPORTS_KEYWORDS = ['nfl', 'nba', 'nhl', 'mlb', 'soccer', 'football', 'basketball',
+                    'hockey', 'baseball', 'playoff', 'super bowl', 'championship game',
+                    'world series', 'finals game', 'trade deadline', 'draft pick',
+                    'coach', 'quarterback', 'touchdown', 'goal scorer', 'player stats']
+_SPORTS_RE = re.compile('|'.join(re.escape(k) for k in _SPORTS_KEYWORDS))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Recency bonus by article age: <= 1h, <= 6h, <= 24h, <= 48h, <= 7 days, older
+_RECENCY_HOURS = (1, 6, 24, 48, 168)
+_RECENCY_BONUSES = (30, 25, 20, 10, 5, 0)
+
+# Category keywords in priority order: the first category with a hit wins
+_CATEGORY_KEYWORDS = {
+    'FDA_APPROVAL': ['fda approv', 'fda clear', 'drug approv'],
+    'MERGER': ['merger', 'merge with'],
+    'ACQUISITION': ['acqui', 'acquire', 'acquisition'],
+    'BANKRUPTCY': ['bankrupt', 'chapter 11', 'chapter 7'],
+    'BUYOUT': ['buyout', 'buy out'],
+    'TAKEOVER': ['takeover', 'take over', 'hostile bid'],
+    'EARNINGS_BEAT': ['earnings beat', 'beat estimates', 'exceed expect', 'profit surge'],
+    'EARNINGS_MISS': ['earnings miss', 'miss estimates', 'below expect', 'profit drop'],
+    'IPO': ['ipo', 'initial public offering', 'going public'],
+    'INVESTIGATION': ['investigation', 'probe', 'inquiry', 'sec investigat'],
+    'LAWSUIT': ['lawsuit', 'sue', 'legal action', 'settlement'],
+    'RECALL': ['recall', 'safety issue', 'defect'],
+    'GUIDANCE_RAISED': ['guidance raised', 'raise forecast', 'raise outlook', 'upbeat guidance'],
+    'GUIDANCE_LOWERED': ['guidance lower', 'cut forecast', 'lower outlook', 'warn'],
+    'BREAKTHROUGH': ['breakthrough', 'revolutionary', 'game-chang'],
+    'ECONOMIC': ['fed', 'interest rate', 'inflation', 'gdp', 'unemployment'],
+    'CRYPTO': ['bitcoin', 'crypto', 'ethereum', 'blockchain']
+}
+
+
+def _ranked_pattern(ranks: Dict[str, int]) -> re.Pattern:
+    """Compile keywords into one regex that reports every (overlapping) hit.
+
+    The zero-width lookahead matches at every position, and ordering the
+    alternation by rank makes the best-ranked keyword win where several
+    start at the same offset.
+    """
+    keywords = sorted(ranks, key=ranks.get)
+    return re.compile('(?=(' + '|'.join(re.escape(k) for k in keywords) + '))')
+
+
+def _best_rank(pattern: re.Pattern, ranks: Dict[str, int], text: str) -> Optional[int]:
+    """Return the lowest rank among keywords found in text, or None"""
+    return min((ranks[match.group(1)] for match in pattern.finditer(text)), default=None)
+
+
+def _title_key(title: Optional[str]) -> str:
+    """Normalize a headline for duplicate detection (case, whitespace)"""
+    return _WHITESPACE_RE.sub(' ', (title or '').lower()).strip()[:120]
+
+
+_CATEGORY_ORDER = tuple(_CATEGORY_KEYWORDS)
+_KEYWORD_RANKS = {}
+for _rank, _keywords in enumerate(_CATEGORY_KEYWORDS.values()):
+    for _keyword in _keywords:
+        _KEYWORD_RANKS.setdefault(_keyword, _rank)
+_CATEGORY_RE = _ranked_pattern(_KEYWORD_RANKS)
+
+# Impact level per category (anything not listed is LOW)
+_IMPACT_BY_CATEGORY = dict.fromkeys(
+    ['FDA_APPROVAL', 'MERGER', 'ACQUISITION', 'BANKRUPTCY', 'BUYOUT', 'TAKEOVER'], 'HIGH'
+)
+_IMPACT_BY_CATEGORY.update(dict.fromkeys(
+    ['EARNINGS_BEAT', 'EARNINGS_MISS', 'IPO', 'INVESTIGATION', 'LAWSUIT',
+     'RECALL', 'GUIDANCE_RAISED', 'GUIDANCE_LOWERED', 'BREAKTHROUGH'], 'MEDIUM'
+))
+
+
+def _published_time(published_at) -> Optional[datetime]:
+    """Naive publish time of an article, or None if missing/unparseable"""
+    if not published_at:
+        return None
+    try:
+        if isinstance(published_at, str):
+            # Parse ISO format (Python 3.11+ accepts the trailing 'Z'
+            # directly, so no intermediate string is built)
+            pub_time = datetime.fromisoformat(published_at)
+        else:
+            pub_time = published_at
+
+        # Make datetime naive for comparison
+        return pub_time.replace(tzinfo=None)
+    except Exception as e:
+        logger.debug(f"Error parsing date: {e}")
+        return None
+
+
+# The detectors below are pure functions of the article text; the same
+# headlines come back across bomb queries and refreshes, so memoize them.
+
+@lru_cache(maxsize=4096)
+def _detect_category(title: str, description: str = '') -> str:
+    """Detect news category from content"""
+    text = f"{title} {description}".lower()
+
+    rank = _best_rank(_CATEGORY_RE, _KEYWORD_RANKS, text)
+    if rank is not None:
+        return _CATEGORY_ORDER[rank]
+
+    return 'GENERAL'
+
+
+def _detect_impact(category: str) -> str:
+    """Detect impact level from category"""
+    return _IMPACT_BY_CATEGORY.get(category, 'LOW')
+
+
+@lru_cache(maxsize=4096)
+def _extract_ticker(title: str, description: str = '') -> Optional[str]:
+    """Try to extract stock ticker from news"""
+    text = f"{title} {description}"
+
+    # A $TICKER mention wins outright; otherwise the first exchange tag,
+    # then the first "TICKER stock" style mention
+    exchange = suffix = None
+    for match in _TICKER_RE.finditer(text):
+        if match.group('dollar'):
+            return match.group('dollar')
+        exchange = exchange or match.group('exch')
+        suffix = suffix or match.group('suf')
+
+    return exchange or suffix
+
+
+# Mock payloads served when no NewsAPI key is configured. Only publishedAt
+# depends on the clock, so the templates carry an '_offset_hours' age instead
+# and _stamp_mock fills in the timestamp per call.
+_MOCK_NEWS_TEMPLATE = (
+    {
+        'title': 'Fed Signals Potential Rate Cut in 2024',
+        'description': 'Federal Reserve hints at possible interest rate reductions',
+        'source': 'Reuters',
+        'url': 'https://reuters.com',
+        '_offset_hours': 0,
+        'image': None,
+        'category': 'ECONOMIC',
+        'impact': 'MEDIUM',
+        'isHot': False,
+        'ticker': None,
+        'weight': 100
+    },
+    {
+        'title': 'Tech Stocks Rally on AI Optimism',
+        'description': 'Major tech companies surge on artificial intelligence growth',
+        'source': 'Bloomberg',
+        'url': 'https://bloomberg.com',
+        '_offset_hours': 2,
+        'image': None,
+        'category': 'GENERAL',
+        'impact': 'LOW',
+        'isHot': False,
+        'ticker': None,
+        'weight': 75
+    }
+)
+
+_MOCK_BOMBS_TEMPLATE = (
+    {
+        'title': 'BREAKING: FDA Approves Major Drug Treatment',
+        'description': 'Pharmaceutical breakthrough could save millions',
+        'source': 'WSJ',
+        'url': 'https://wsj.com',
+        '_offset_hours': 0,
+        'image': None,
+        'impact': 'HIGH',
+        'category': 'FDA_APPROVAL',
+        'isHot': True,
+        'ticker': None,
+        'weight': 168
+    },
+    {
+        'title': 'Major Tech Company Announces $50B Acquisition',
+        'description': 'Largest acquisition in sector history to reshape industry',
+        'source': 'Bloomberg',
+        'url': 'https://bloomberg.com',
+        '_offset_hours': 3,
+        'image': None,
+        'impact': 'HIGH',
+        'category': 'ACQUISITION',
+        'isHot': True,
+        'ticker': None,
+        'weight': 160
+    },
+    {
+        'title': 'Company Reports Earnings Beat, Stock Surges',
+        'description': 'Q4 earnings exceed analyst expectations by 25%',
+        'source': 'CNBC',
+        'url': 'https://cnbc.com',
+        '_offset_hours': 5,
+        'image': None,
+        'impact': 'HIGH',
+        'category': 'EARNINGS_BEAT',
+        'isHot': True,
+        'ticker': None,
+        'weight': 145
+    },
+    {
+        'title': 'IPO Launch: New Tech Unicorn Goes Public',
+        'description': 'Highly anticipated IPO opens with strong demand',
+        'source': 'MarketWatch',
+        'url': 'https://marketwatch.com',
+        '_offset_hours': 8,
+        'image': None,
+        'impact': 'MEDIUM',
+        'category': 'IPO',
+        'isHot': False,
+        'ticker': None,
+        'weight': 127
+    },
+    {
+        'title': 'Biotech Firm Reports Breakthrough in Cancer Research',
+        'description': 'Phase 3 trials show promising results for new treatment',
+        'source': 'Reuters',
+        'url': 'https://reuters.com',
+        '_offset_hours': 12,
+        'image': None,
+        'impact': 'MEDIUM',
+        'category': 'BREAKTHROUGH',
+        'isHot': False,
+        'ticker': None,
+        'weight': 115
+    },
+    {
+        'title': 'SEC Launches Investigation into Trading Practices',
+        'description': 'Regulatory probe focuses on potential market manipulation',
+        'source': 'Financial Times',
+        'url': 'https://ft.com',
+        '_offset_hours': 24,
+        'image': None,
+        'impact': 'MEDIUM',
+        'category': 'INVESTIGATION',
+        'isHot': False,
+        'ticker': None,
+        'weight': 108
+    },
+    {
+        'title': 'Company Raises Full-Year Guidance',
+        'description': 'Strong demand drives upward revision in revenue forecast',
+        'source': 'Yahoo Finance',
+        'url': 'https://finance.yahoo.com',
+        '_offset_hours': 48,
+        'image': None,
+        'impact': 'MEDIUM',
+        'category': 'GUIDANCE_RAISED',
+        'isHot': False,
+        'ticker': None,
+        'weight': 90
+    },
+    {
+        'title': 'Bitcoin Reaches New Monthly High',
+        'description': 'Cryptocurrency rally continues amid institutional interest',
+        'source': 'CNBC',
+        'url': 'https://cnbc.com',
+        '_offset_hours': 72,
+        'image': None,
+        'impact': 'LOW',
+        'category': 'CRYPTO',
+        'isHot': False,
+        'ticker': None,
+        'weight': 75
+    }
+)
+
+# Merged mock list in both sort orders; ages and weights are fixed, so the
+# ordering is the same on every call
+_MOCK_CATEGORIZED_TEMPLATE = _MOCK_BOMBS_TEMPLATE + _MOCK_NEWS_TEMPLATE
+_MOCK_CATEGORIZED_BY_WEIGHT = tuple(
+    sorted(_MOCK_CATEGORIZED_TEMPLATE, key=itemgetter('weight'), reverse=True)
+)
+_MOCK_CATEGORIZED_BY_TIME = tuple(
+    sorted(_MOCK_CATEGORIZED_TEMPLATE, key=itemgetter('_offset_hours'))
+)
+
+
+def _stamp_mock(templates) -> List[Dict]:
+    """Fresh mock articles with publishedAt set relative to now"""
+    now = datetime.now()
+    articles = []
+    for template in templates:
+        article = {}
+        for key, value in template.items():
+            if key == '_offset_hours':
+                article['publishedAt'] = (now - timedelta(hours=value)).isoformat()
+            else:
+                article[key] = value
+        articles.append(article)
+    return articles
+
 
 class NewsService:
     """News API service for market news"""
@@ -36,6 +358,14 @@ class NewsService:
                 logger.error(f"Failed to initialize News API client: {str(e)}")
                 self.client = None
 
+        # Successful NewsAPI responses keyed by (endpoint, params)
+        self._response_cache = TTLCache(maxsize=256, ttl=120)
+        self._response_lock = Lock()
+
+        # Company short names per ticker (see _get_company_name)
+        self._company_names: Dict[str, str] = {}
+        self._company_name_lock = Lock()
+
         # High-impact keywords for "news bombs"
         self.bomb_keywords = [
             'FDA approval', 'merger', 'acquisition', 'earnings beat',
@@ -81,7 +411,29 @@ class NewsService:
             'Investopedia': 8
         }
 
-    def calculate_news_weight(self, article: Dict) -> float:
+        # Source names lowercased once; the first name in the table that
+        # appears in the article source decides the bonus
+        self._source_ranks = {}
+        for rank, source_name in enumerate(self.source_bonuses):
+            self._source_ranks.setdefault(source_name.lower(), rank)
+        self._source_bonus_list = list(self.source_bonuses.values())
+        self._source_re = _ranked_pattern(self._source_ranks)
+
+    def _call_api(self, endpoint: str, **params) -> Dict:
+        """Call a NewsAPI client endpoint, reusing recent identical responses"""
+        key = (endpoint, tuple(sorted(params.items())))
+        with self._response_lock:
+            cached = self._response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = getattr(self.client, endpoint)(**params)
+        if response.get('status') == 'ok':
+            with self._response_lock:
+                self._response_cache[key] = response
+        return response
+
+    def calculate_news_weight(self, article: Dict, now: Optional[datetime] = None) -> float:
         """
         Calculate weight/importance score for a news article
 
@@ -91,8 +443,24 @@ class NewsService:
         - Recency bonus (0-30)
         - Hot news bonus (0-20)
 
+        Args:
+            article: News article dict
+            now: Reference time for recency (defaults to datetime.now())
+
         Returns: Weight score (0-170)
         """
+        weight = self._static_weight(article)
+
+        # Recency bonus (max 30 points for articles within last hour)
+        pub_time = _published_time(article.get('publishedAt', ''))
+        if pub_time is not None:
+            hours_old = ((now or datetime.now()) - pub_time).total_seconds() / 3600
+            weight += _RECENCY_BONUSES[bisect_left(_RECENCY_HOURS, hours_old)]
+
+        return weight
+
+    def _static_weight(self, article: Dict) -> float:
+        """Category, source and hot-news parts of the weight (no recency)"""
         weight = 0.0
 
         # Category weight
@@ -101,38 +469,9 @@ class NewsService:
 
         # Source bonus
         source = article.get('source', '')
-        for source_name, bonus in self.source_bonuses.items():
-            if source_name.lower() in source.lower():
-                weight += bonus
-                break
-
-        # Recency bonus (max 30 points for articles within last hour)
-        published_at = article.get('publishedAt', '')
-        if published_at:
-            try:
-                if isinstance(published_at, str):
-                    # Parse ISO format
-                    pub_time = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                else:
-                    pub_time = published_at
-
-                # Make datetime naive for comparison
-                if pub_time.tzinfo:
-                    pub_time = pub_time.replace(tzinfo=None)
-
-                hours_old = (datetime.now() - pub_time).total_seconds() / 3600
-                if hours_old <= 1:
-                    weight += 30
-                elif hours_old <= 6:
-                    weight += 25
-                elif hours_old <= 24:
-                    weight += 20
-                elif hours_old <= 48:
-                    weight += 10
-                elif hours_old <= 168:  # 7 days
-                    weight += 5
-            except Exception as e:
-                logger.debug(f"Error parsing date: {e}")
+        rank = _best_rank(self._source_re, self._source_ranks, source.lower())
+        if rank is not None:
+            weight += self._source_bonus_list[rank]
 
         # Hot news bonus
         if article.get('isHot', False):
@@ -140,67 +479,69 @@ class NewsService:
 
         return weight
 
+    def _weigh_many(self, articles: List[Dict]) -> None:
+        """Set 'weight' on each article against a single reference time"""
+        now = datetime.now()
+        for article in articles:
+            article['weight'] = self.calculate_news_weight(article, now)
+
     def _detect_category(self, title: str, description: str = '') -> str:
         """Detect news category from content"""
-        text = f"{title} {description}".lower()
-
-        category_keywords = {
-            'FDA_APPROVAL': ['fda approv', 'fda clear', 'drug approv'],
-            'MERGER': ['merger', 'merge with'],
-            'ACQUISITION': ['acqui', 'acquire', 'acquisition'],
-            'BANKRUPTCY': ['bankrupt', 'chapter 11', 'chapter 7'],
-            'BUYOUT': ['buyout', 'buy out'],
-            'TAKEOVER': ['takeover', 'take over', 'hostile bid'],
-            'EARNINGS_BEAT': ['earnings beat', 'beat estimates', 'exceed expect', 'profit surge'],
-            'EARNINGS_MISS': ['earnings miss', 'miss estimates', 'below expect', 'profit drop'],
-            'IPO': ['ipo', 'initial public offering', 'going public'],
-            'INVESTIGATION': ['investigation', 'probe', 'inquiry', 'sec investigat'],
-            'LAWSUIT': ['lawsuit', 'sue', 'legal action', 'settlement'],
-            'RECALL': ['recall', 'safety issue', 'defect'],
-            'GUIDANCE_RAISED': ['guidance raised', 'raise forecast', 'raise outlook', 'upbeat guidance'],
-            'GUIDANCE_LOWERED': ['guidance lower', 'cut forecast', 'lower outlook', 'warn'],
-            'BREAKTHROUGH': ['breakthrough', 'revolutionary', 'game-chang'],
-            'ECONOMIC': ['fed', 'interest rate', 'inflation', 'gdp', 'unemployment'],
-            'CRYPTO': ['bitcoin', 'crypto', 'ethereum', 'blockchain']
-        }
-
-        for category, keywords in category_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return category
-
-        return 'GENERAL'
+        return _detect_category(title, description)
 
     def _detect_impact(self, category: str) -> str:
         """Detect impact level from category"""
-        high_impact = ['FDA_APPROVAL', 'MERGER', 'ACQUISITION', 'BANKRUPTCY', 'BUYOUT', 'TAKEOVER']
-        medium_impact = ['EARNINGS_BEAT', 'EARNINGS_MISS', 'IPO', 'INVESTIGATION', 'LAWSUIT',
-                        'RECALL', 'GUIDANCE_RAISED', 'GUIDANCE_LOWERED', 'BREAKTHROUGH']
-
-        if category in high_impact:
-            return 'HIGH'
-        elif category in medium_impact:
-            return 'MEDIUM'
-        return 'LOW'
+        return _detect_impact(category)
 
     def _extract_ticker(self, title: str, description: str = '') -> Optional[str]:
         """Try to extract stock ticker from news"""
-        import re
-        text = f"{title} {description}"
-
-        # Common patterns: $AAPL, (NASDAQ: AAPL), AAPL stock
-        patterns = [
-            r'\$([A-Z]{1,5})\b',
-            r'\((?:NASDAQ|NYSE|AMEX):\s*([A-Z]{1,5})\)',
-            r'\b([A-Z]{2,5})\s+(?:stock|shares|inc|corp)',
-        ]
+        return _extract_ticker(title, description)
+
+    @staticmethod
+    def _market_news_params(limit: int) -> Dict:
+        """NewsAPI parameters for top business headlines"""
+        return {'category': 'business', 'language': 'en', 'country': 'us', 'page_size': limit}
+
+    @staticmethod
+    def _stock_news_params(ticker: str, days: int) -> Dict:
+        """NewsAPI parameters for a ticker's news over the last ``days``"""
+        to_date = datetime.now()
+        from_date = to_date - timedelta(days=days)
+        return {
+            'q': ticker,
+            'from_param': from_date.strftime('%Y-%m-%d'),
+            'to': to_date.strftime('%Y-%m-%d'),
+            'language': 'en',
+            'sort_by': 'relevancy',
+            'page_size': 10
+        }
 
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(1)
+    @staticmethod
+    def _bomb_params(query: str, from_date: str) -> Dict:
+        """NewsAPI parameters for one news-bomb search query"""
+        return {
+            'q': query,
+            'from_param': from_date,
+            'language': 'en',
+            'sort_by': 'publishedAt',
+            'page_size': 5,
+            'domains': _BOMB_DOMAINS  # Only financial news sources
+        }
 
-        return None
+    @staticmethod
+    def _parse_articles(response: Dict) -> List[Dict]:
+        """Flatten NewsAPI articles into the service's article dicts"""
+        articles = []
+        for article in response.get('articles', []):
+            articles.append({
+                'title': article.get('title', ''),
+                'description': article.get('description', ''),
+                'source': article.get('source', {}).get('name', 'Unknown'),
+                'url': article.get('url', ''),
+                'publishedAt': article.get('publishedAt', ''),
+                'image': article.get('urlToImage', ''),
+            })
+        return articles
 
     def get_market_news(self, limit: int = 20) -> List[Dict]:
         """
@@ -213,28 +554,12 @@ class NewsService:
 
         try:
             # Get top business headlines
-            response = self.client.get_top_headlines(
-                category='business',
-                language='en',
-                country='us',
-                page_size=limit
-            )
+            response = self._call_api('get_top_headlines', **self._market_news_params(limit))
 
             if response['status'] != 'ok':
                 return self._get_mock_news()
 
-            articles = []
-            for article in response.get('articles', []):
-                articles.append({
-                    'title': article.get('title', ''),
-                    'description': article.get('description', ''),
-                    'source': article.get('source', {}).get('name', 'Unknown'),
-                    'url': article.get('url', ''),
-                    'publishedAt': article.get('publishedAt', ''),
-                    'image': article.get('urlToImage', ''),
-                })
-
-            return articles
+            return self._parse_articles(response)
 
         except Exception as e:
             logger.error(f"Error fetching market news: {str(e)}")
@@ -252,38 +577,75 @@ class NewsService:
             return []
 
         try:
-            # Calculate date range
-            to_date = datetime.now()
-            from_date = to_date - timedelta(days=days)
-
-            response = self.client.get_everything(
-                q=ticker,
-                from_param=from_date.strftime('%Y-%m-%d'),
-                to=to_date.strftime('%Y-%m-%d'),
-                language='en',
-                sort_by='relevancy',
-                page_size=10
-            )
+            response = self._call_api('get_everything', **self._stock_news_params(ticker, days))
 
             if response['status'] != 'ok':
                 return []
 
-            articles = []
+            return self._parse_articles(response)
+
+        except Exception as e:
+            logger.error(f"Error fetching news for {ticker}: {str(e)}")
+            return []
+
+    def _search_bombs(self, query: str, from_date: str) -> List[Dict]:
+        """Run one news-bomb search query and return the stock-relevant hits"""
+        try:
+            response = self._call_api('get_everything', **self._bomb_params(query, from_date))
+            return self._bombs_from_response(response)
+        except Exception as e:
+            logger.error(f"Error searching query {query}: {str(e)}")
+            return []
+
+    def _bombs_from_response(self, response: Dict) -> List[Dict]:
+        """Turn a bomb search response into weighted, stock-relevant bombs"""
+        bombs = []
+        if response['status'] == 'ok':
             for article in response.get('articles', []):
-                articles.append({
-                    'title': article.get('title', ''),
-                    'description': article.get('description', ''),
+                title = article.get('title', '')
+                description = article.get('description', '')
+
+                # Use smart category detection instead of assuming from query
+                category = self._detect_category(title, description)
+
+                # Extract ticker - REQUIRED for it to be a valid stock news
+                ticker = self._extract_ticker(title, description)
+
+                # FILTER: Only include if we found a ticker OR category is stock-related
+                if not ticker and category == 'GENERAL':
+                    continue  # Skip non-stock news
+
+                bomb = {
+                    'title': title,
+                    'description': description,
                     'source': article.get('source', {}).get('name', 'Unknown'),
                     'url': article.get('url', ''),
                     'publishedAt': article.get('publishedAt', ''),
                     'image': article.get('urlToImage', ''),
-                })
+                    'impact': self._detect_impact(category),
+                    'category': category,
+                    'isHot': True,
+                    'ticker': ticker
+                }
+                bombs.append(bomb)
 
-            return articles
+        self._weigh_many(bombs)
+        return bombs
 
-        except Exception as e:
-            logger.error(f"Error fetching news for {ticker}: {str(e)}")
-            return []
+    def _rank_bombs(self, all_bombs: List[Dict], limit: int) -> List[Dict]:
+        """Deduplicate bombs by headline and return the heaviest ``limit``"""
+        # Remove duplicates by title, keeping the most important copy
+        unique_bombs = {}
+        for bomb in all_bombs:
+            key = _title_key(bomb['title'])
+            kept = unique_bombs.get(key)
+            if kept is None or bomb['weight'] > kept['weight']:
+                unique_bombs[key] = bomb
+
+        logger.info(f"✅ Found {len(unique_bombs)} relevant stock news bombs")
+
+        # Top bombs by weight (most important first)
+        return heapq.nlargest(limit, unique_bombs.values(), key=itemgetter('weight'))
 
     def get_news_bombs(self, limit: int = 10, days: int = 1) -> List[Dict]:
         """
@@ -297,77 +659,63 @@ class NewsService:
         try:
             # Search for high-impact keywords IN FINANCE/BUSINESS context
             all_bombs = []
+            from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-            # Use more targeted search queries to get STOCK-RELATED news only
-            finance_queries = [
-                'stock acquisition OR stock merger',
-                'stock earnings beat OR earnings miss',
-                'FDA approval stock',
-                'IPO stock market',
-                'stock bankruptcy OR stock buyout'
+            # Queries are independent HTTP calls, so run them concurrently
+            futures = [
+                _EXECUTOR.submit(self._search_bombs, query, from_date)
+                for query in _BOMB_QUERIES
             ]
+            for future in futures:
+                all_bombs.extend(future.result())
 
-            for query in finance_queries:
-                try:
-                    response = self.client.get_everything(
-                        q=query,
-                        from_param=(datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d'),
-                        language='en',
-                        sort_by='publishedAt',
-                        page_size=5,
-                        domains='reuters.com,bloomberg.com,cnbc.com,marketwatch.com,wsj.com,finance.yahoo.com,seekingalpha.com'  # Only financial news sources
-                    )
+            return self._rank_bombs(all_bombs, limit)
 
-                    if response['status'] == 'ok':
-                        for article in response.get('articles', []):
-                            title = article.get('title', '')
-                            description = article.get('description', '')
-
-                            # Use smart category detection instead of assuming from query
-                            category = self._detect_category(title, description)
-
-                            # Extract ticker - REQUIRED for it to be a valid stock news
-                            ticker = self._extract_ticker(title, description)
-
-                            # FILTER: Only include if we found a ticker OR category is stock-related
-                            if not ticker and category == 'GENERAL':
-                                continue  # Skip non-stock news
-
-                            bomb = {
-                                'title': title,
-                                'description': description,
-                                'source': article.get('source', {}).get('name', 'Unknown'),
-                                'url': article.get('url', ''),
-                                'publishedAt': article.get('publishedAt', ''),
-                                'image': article.get('urlToImage', ''),
-                                'impact': self._detect_impact(category),
-                                'category': category,
-                                'isHot': True,
-                                'ticker': ticker
-                            }
-                            bomb['weight'] = self.calculate_news_weight(bomb)
-                            all_bombs.append(bomb)
-                except Exception as e:
-                    logger.error(f"Error searching query {query}: {str(e)}")
-                    continue
+        except Exception as e:
+            logger.error(f"Error fetching news bombs: {str(e)}")
+            return self._get_mock_bombs()
 
-            # Sort by weight (most important first)
-            all_bombs.sort(key=lambda x: x['weight'], reverse=True)
+    def _get_company_name(self, ticker: str) -> str:
+        """Lowercased company short name for ticker validation ('' if unknown)
 
-            # Remove duplicates by title
-            seen_titles = set()
-            unique_bombs = []
-            for bomb in all_bombs:
-                if bomb['title'] not in seen_titles:
-                    seen_titles.add(bomb['title'])
-                    unique_bombs.append(bomb)
-
-            logger.info(f"✅ Found {len(unique_bombs)} relevant stock news bombs")
-            return unique_bombs[:limit]
+        Names effectively never change, so non-empty names are kept for the
+        lifetime of the service; failed or empty lookups are retried next time.
+        """
+        with self._company_name_lock:
+            if ticker in self._company_names:
+                return self._company_names[ticker]
 
+        try:
+            from app.services.yfinance_service import get_yfinance_service
+            yf_service = get_yfinance_service()
+            fundamentals = yf_service.get_fundamentals(ticker)
+            company_name = fundamentals.get('shortName', '').lower() if fundamentals else ''
         except Exception as e:
-            logger.error(f"Error fetching news bombs: {str(e)}")
-            return self._get_mock_bombs()
+            logger.warning(f"Could not get company name for {ticker}: {e}")
+            return ''
+
+        if company_name:
+            with self._company_name_lock:
+                self._company_names[ticker] = company_name
+        return company_name
+
+    def _fetch_categorized_sources(self, days: int, ticker: Optional[str]) -> Tuple[List[Dict], List[Dict], List[Dict], str]:
+        """Fetch (bombs, market news, stock news, company name) concurrently
+
+        The bomb search already fans out over the pool, so it runs on the
+        calling thread while the other sources are fetched alongside it.
+        """
+        market_future = _EXECUTOR.submit(self.get_market_news, limit=20)
+        stock_future = _EXECUTOR.submit(self.get_stock_news, ticker, days=days) if ticker else None
+        name_future = _EXECUTOR.submit(self._get_company_name, ticker) if ticker else None
+
+        bombs = self.get_news_bombs(limit=30, days=days)
+        return (
+            bombs,
+            market_future.result(),
+            stock_future.result() if stock_future else [],
+            name_future.result() if name_future else ''
+        )
 
     def get_categorized_news(
         self,
@@ -393,12 +741,14 @@ class NewsService:
         try:
             all_news = []
 
+            # Bombs, market headlines, stock news and the company name are
+            # independent network calls, fetched concurrently
+            bombs, market_news, stock_news, company_name = self._fetch_categorized_sources(days, ticker)
+
             # Get news bombs (high-impact)
-            bombs = self.get_news_bombs(limit=30, days=days)
             all_news.extend(bombs)
 
             # Get general market news
-            market_news = self.get_market_news(limit=20)
             for article in market_news:
                 title = article.get('title', '')
                 description = article.get('description', '')
@@ -416,12 +766,10 @@ class NewsService:
                     'isHot': False,
                     'ticker': self._extract_ticker(title, description)
                 }
-                news_item['weight'] = self.calculate_news_weight(news_item)
                 all_news.append(news_item)
 
             # If ticker specified, get stock-specific news
             if ticker:
-                stock_news = self.get_stock_news(ticker, days=days)
                 for article in stock_news:
                     title = article.get('title', '')
                     description = article.get('description', '')
@@ -439,54 +787,44 @@ class NewsService:
                         'isHot': False,
                         'ticker': ticker
                     }
-                    news_item['weight'] = self.calculate_news_weight(news_item)
                     all_news.append(news_item)
 
+            # Weigh the market/stock items added above (bombs come pre-weighted)
+            self._weigh_many(all_news[len(bombs):])
+
             # Remove duplicates
             seen_titles = set()
             unique_news = []
             for news in all_news:
-                if news['title'] not in seen_titles:
-                    seen_titles.add(news['title'])
-                    unique_news.append(news)
+                key = _title_key(news['title'])
+                if key in seen_titles:
+                    continue
+                seen_titles.add(key)
+                unique_news.append(news)
 
             # Filter by ticker if specified (STRICT VALIDATION)
             if ticker:
-                # Get company name for better validation
-                try:
-                    from app.services.yfinance_service import get_yfinance_service
-                    yf_service = get_yfinance_service()
-                    fundamentals = yf_service.get_fundamentals(ticker)
-                    company_name = fundamentals.get('shortName', '').lower() if fundamentals else ''
-                except Exception as e:
-                    company_name = ''
-                    logger.warning(f"Could not get company name for {ticker}: {e}")
-
                 ticker_lower = ticker.lower()
                 validated_news = []
 
-                # Sports keywords to filter out
-                sports_keywords = ['nfl', 'nba', 'nhl', 'mlb', 'soccer', 'football', 'basketball',
-                                 'hockey', 'baseball', 'playoff', 'super bowl', 'championship game',
-                                 'world series', 'finals game', 'trade deadline', 'draft pick',
-                                 'coach', 'quarterback', 'touchdown', 'goal scorer', 'player stats']
+                # $AAPL, a whitespace-delimited word, or (AAPL) - one regex
+                # search per title instead of four substring/split passes
+                escaped = re.escape(ticker_lower)
+                ticker_context_re = re.compile(rf'\${escaped}|(?<!\S){escaped}(?!\S)|\({escaped}\)')
 
                 for n in unique_news:
-                    title_lower = n.get('title', '').lower()
-                    desc_lower = n.get('description', '').lower()
+                    title_lower = (n.get('title') or '').lower()
+                    desc_lower = (n.get('description') or '').lower()
 
                     # Skip if it's sports news
-                    is_sports = any(keyword in title_lower or keyword in desc_lower for keyword in sports_keywords)
-                    if is_sports:
+                    # (NUL separator so no keyword can span title and description)
+                    if _SPORTS_RE.search(f'{title_lower}\x00{desc_lower}'):
                         continue
 
                     # Check if ticker or company name appears in meaningful context
                     ticker_match = (
                         n.get('ticker') == ticker or
-                        f'${ticker_lower}' in title_lower or  # Stock ticker format like $AAPL
-                        f' {ticker_lower} ' in f' {title_lower} ' or  # Ticker as separate word
-                        f'({ticker_lower})' in title_lower or  # Ticker in parentheses
-                        ticker_lower in title_lower.split()  # Ticker as complete word
+                        ticker_context_re.search(title_lower) is not None
                     )
 
                     company_match = False
@@ -501,13 +839,11 @@ class NewsService:
 
                 unique_news = validated_news
 
-            # Sort based on preference
+            # Select the top articles based on preference
             if sort_by == 'weighted':
-                unique_news.sort(key=lambda x: x.get('weight', 0), reverse=True)
-            else:  # newest
-                unique_news.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
-
-            return unique_news[:limit]
+                return heapq.nlargest(limit, unique_news, key=lambda x: x.get('weight', 0))
+            # newest
+            return heapq.nlargest(limit, unique_news, key=lambda x: x.get('publishedAt', ''))
 
         except Exception as e:
             logger.error(f"Error fetching categorized news: {str(e)}")
@@ -526,19 +862,19 @@ class NewsService:
             ticker=ticker
         )
 
-        # Calculate news metrics
-        total_weight = sum(n.get('weight', 0) for n in news)
-        avg_weight = total_weight / len(news) if news else 0
-
-        # Count by category
+        # Calculate news metrics and count by category in one pass
+        total_weight = 0
         category_counts = {}
         for n in news:
+            total_weight += n.get('weight', 0)
             cat = n.get('category', 'GENERAL')
             category_counts[cat] = category_counts.get(cat, 0) + 1
+        avg_weight = total_weight / len(news) if news else 0
 
-        # Sort by newest and weighted
-        newest = sorted(news, key=lambda x: x.get('publishedAt', ''), reverse=True)[:10]
-        weighted = sorted(news, key=lambda x: x.get('weight', 0), reverse=True)[:10]
+        # Newest first; news already comes back sorted by weight. Every
+        # article dict is built with a publishedAt key, so itemgetter is safe
+        newest = heapq.nlargest(10, news, key=itemgetter('publishedAt'))
+        weighted = news[:10]
 
         return {
             'ticker': ticker,
@@ -552,154 +888,18 @@ class NewsService:
 
     def _get_mock_news(self) -> List[Dict]:
         """Mock news data"""
-        return [
-            {
-                'title': 'Fed Signals Potential Rate Cut in 2024',
-                'description': 'Federal Reserve hints at possible interest rate reductions',
-                'source': 'Reuters',
-                'url': 'https://reuters.com',
-                'publishedAt': datetime.now().isoformat(),
-                'image': None,
-                'category': 'ECONOMIC',
-                'impact': 'MEDIUM',
-                'isHot': False,
-                'ticker': None,
-                'weight': 100
-            },
-            {
-                'title': 'Tech Stocks Rally on AI Optimism',
-                'description': 'Major tech companies surge on artificial intelligence growth',
-                'source': 'Bloomberg',
-                'url': 'https://bloomberg.com',
-                'publishedAt': (datetime.now() - timedelta(hours=2)).isoformat(),
-                'image': None,
-                'category': 'GENERAL',
-                'impact': 'LOW',
-                'isHot': False,
-                'ticker': None,
-                'weight': 75
-            }
-        ]
+        return _stamp_mock(_MOCK_NEWS_TEMPLATE)
 
     def _get_mock_bombs(self) -> List[Dict]:
         """Mock news bombs"""
-        return [
-            {
-                'title': 'BREAKING: FDA Approves Major Drug Treatment',
-                'description': 'Pharmaceutical breakthrough could save millions',
-                'source': 'WSJ',
-                'url': 'https://wsj.com',
-                'publishedAt': datetime.now().isoformat(),
-                'image': None,
-                'impact': 'HIGH',
-                'category': 'FDA_APPROVAL',
-                'isHot': True,
-                'ticker': None,
-                'weight': 168
-            },
-            {
-                'title': 'Major Tech Company Announces $50B Acquisition',
-                'description': 'Largest acquisition in sector history to reshape industry',
-                'source': 'Bloomberg',
-                'url': 'https://bloomberg.com',
-                'publishedAt': (datetime.now() - timedelta(hours=3)).isoformat(),
-                'image': None,
-                'impact': 'HIGH',
-                'category': 'ACQUISITION',
-                'isHot': True,
-                'ticker': None,
-                'weight': 160
-            },
-            {
-                'title': 'Company Reports Earnings Beat, Stock Surges',
-                'description': 'Q4 earnings exceed analyst expectations by 25%',
-                'source': 'CNBC',
-                'url': 'https://cnbc.com',
-                'publishedAt': (datetime.now() - timedelta(hours=5)).isoformat(),
-                'image': None,
-                'impact': 'HIGH',
-                'category': 'EARNINGS_BEAT',
-                'isHot': True,
-                'ticker': None,
-                'weight': 145
-            },
-            {
-                'title': 'IPO Launch: New Tech Unicorn Goes Public',
-                'description': 'Highly anticipated IPO opens with strong demand',
-                'source': 'MarketWatch',
-                'url': 'https://marketwatch.com',
-                'publishedAt': (datetime.now() - timedelta(hours=8)).isoformat(),
-                'image': None,
-                'impact': 'MEDIUM',
-                'category': 'IPO',
-                'isHot': False,
-                'ticker': None,
-                'weight': 127
-            },
-            {
-                'title': 'Biotech Firm Reports Breakthrough in Cancer Research',
-                'description': 'Phase 3 trials show promising results for new treatment',
-                'source': 'Reuters',
-                'url': 'https://reuters.com',
-                'publishedAt': (datetime.now() - timedelta(hours=12)).isoformat(),
-                'image': None,
-                'impact': 'MEDIUM',
-                'category': 'BREAKTHROUGH',
-                'isHot': False,
-                'ticker': None,
-                'weight': 115
-            },
-            {
-                'title': 'SEC Launches Investigation into Trading Practices',
-                'description': 'Regulatory probe focuses on potential market manipulation',
-                'source': 'Financial Times',
-                'url': 'https://ft.com',
-                'publishedAt': (datetime.now() - timedelta(days=1)).isoformat(),
-                'image': None,
-                'impact': 'MEDIUM',
-                'category': 'INVESTIGATION',
-                'isHot': False,
-                'ticker': None,
-                'weight': 108
-            },
-            {
-                'title': 'Company Raises Full-Year Guidance',
-                'description': 'Strong demand drives upward revision in revenue forecast',
-                'source': 'Yahoo Finance',
-                'url': 'https://finance.yahoo.com',
-                'publishedAt': (datetime.now() - timedelta(days=2)).isoformat(),
-                'image': None,
-                'impact': 'MEDIUM',
-                'category': 'GUIDANCE_RAISED',
-                'isHot': False,
-                'ticker': None,
-                'weight': 90
-            },
-            {
-                'title': 'Bitcoin Reaches New Monthly High',
-                'description': 'Cryptocurrency rally continues amid institutional interest',
-                'source': 'CNBC',
-                'url': 'https://cnbc.com',
-                'publishedAt': (datetime.now() - timedelta(days=3)).isoformat(),
-                'image': None,
-                'impact': 'LOW',
-                'category': 'CRYPTO',
-                'isHot': False,
-                'ticker': None,
-                'weight': 75
-            }
-        ]
+        return _stamp_mock(_MOCK_BOMBS_TEMPLATE)
 
     def _get_mock_categorized_news(self, sort_by: str, limit: int) -> List[Dict]:
         """Mock categorized news data"""
-        all_news = self._get_mock_bombs() + self._get_mock_news()
-
         if sort_by == 'weighted':
-            all_news.sort(key=lambda x: x.get('weight', 0), reverse=True)
-        else:  # newest
-            all_news.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
-
-        return all_news[:limit]
+            return _stamp_mock(_MOCK_CATEGORIZED_BY_WEIGHT[:limit])
+        # newest
+        return _stamp_mock(_MOCK_CATEGORIZED_BY_TIME[:limit])
 
 
 # Global singleton
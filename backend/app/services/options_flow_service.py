@@ -10,14 +10,160 @@ This service identifies unusual options activity that may signal
 smart money positioning before major price moves.
 """
 
-from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from bisect import bisect_left
+from collections import OrderedDict
+from enum import IntEnum
+from types import MappingProxyType
+from concurrent.futures import Future
+from contextlib import closing
+import json
 import logging
+import math
+import os
+import sqlite3
+import threading
+import time
 
-import yfinance as yf
+import numpy as np
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Most tickers kept in the in-memory options cache
+_CACHE_MAXSIZE = 4096
+
+# Option expiration dates change at most daily; reuse them for an hour
+_EXPIRY_TTL_SECONDS = 60 * 60
+
+# Pace of Yahoo option requests: sustained rate and burst size. Unthrottled
+# bursts get 429s or stale chains back from Yahoo.
+_YAHOO_REQUESTS_PER_SECOND = 2.0
+_YAHOO_BURST = 10
+
+# Optional SQLite file backing the options cache across restarts (off unless set)
+_DISK_CACHE_PATH = os.getenv("OPTIONS_CACHE_PATH", "")
+
+
+class FlowSentiment(IntEnum):
+    """Options flow sentiment; the API exposes the member name"""
+    VERY_BULLISH = 1
+    BULLISH = 2
+    NEUTRAL = 3
+    BEARISH = 4
+    VERY_BEARISH = 5
+
+
+class Signal(IntEnum):
+    """Options flow trading signal; the API exposes the member name"""
+    UNUSUAL_CALL_ACTIVITY = 1
+    UNUSUAL_PUT_ACTIVITY = 2
+    HEAVY_CALL_VOLUME = 3
+    HEAVY_PUT_VOLUME = 4
+
+
+# Short aliases for the lookup tables below
+_FS = FlowSentiment
+_SIG = Signal
+
+# Put/call ratio bands for flow sentiment and signals, used with bisect_left.
+# Lower cut-offs are strict (pc < 0.5), so they are stored as the next float
+# below the boundary; upper cut-offs (pc > 1.0) are used as-is.
+_SENTIMENT_THRESHOLDS = (math.nextafter(0.5, 0), math.nextafter(0.7, 0), 1.0, 1.5)
+_SENTIMENT_LABELS = (
+    # Normal activity
+    (_FS.BULLISH, _FS.BULLISH, _FS.NEUTRAL, _FS.BEARISH, _FS.BEARISH),
+    # Unusual activity upgrades the outer bands
+    (_FS.VERY_BULLISH, _FS.BULLISH, _FS.NEUTRAL, _FS.BEARISH, _FS.VERY_BEARISH),
+)
+
+_SIGNAL_THRESHOLDS = (math.nextafter(0.5, 0), math.nextafter(0.6, 0), 1.2, 1.5)
+# Volume tiers of the side that matters: <= 1000, <= 5000, > 5000
+_SIGNAL_VOLUME_TIERS = (1000, 5000)
+_SIGNAL_TABLE = (
+    # pc < 0.5: unusual call buying, else heavy call volume
+    ((None, None, _SIG.HEAVY_CALL_VOLUME), (None, _SIG.UNUSUAL_CALL_ACTIVITY, _SIG.UNUSUAL_CALL_ACTIVITY)),
+    # 0.5 <= pc < 0.6: heavy call volume
+    ((None, None, _SIG.HEAVY_CALL_VOLUME), (None, None, _SIG.HEAVY_CALL_VOLUME)),
+    # 0.6 <= pc <= 1.2: no signal
+    ((None, None, None), (None, None, None)),
+    # 1.2 < pc <= 1.5: heavy put volume
+    ((None, None, _SIG.HEAVY_PUT_VOLUME), (None, None, _SIG.HEAVY_PUT_VOLUME)),
+    # pc > 1.5: unusual put buying, else heavy put volume
+    ((None, None, _SIG.HEAVY_PUT_VOLUME), (None, _SIG.UNUSUAL_PUT_ACTIVITY, _SIG.UNUSUAL_PUT_ACTIVITY)),
+)
+
+
+# Result served when no options data is available; "ticker" and the
+# mutable "large_trades" list are filled in per call
+_DEFAULT_OPTIONS_DATA = MappingProxyType({
+    "ticker": None,
+    "call_volume": 0,
+    "put_volume": 0,
+    "total_volume": 0,
+    "put_call_ratio": 0,
+    "call_open_interest": 0,
+    "put_open_interest": 0,
+    "unusual_activity": False,
+    "flow_sentiment": "UNKNOWN",
+    "signal": None,
+    "large_trades": None
+})
+
+# yfinance (and its HTML/HTTP stack) is imported on first use, so workers
+# that never serve options data don't pay for it at startup
+_yf = None
+
+
+def _yfinance():
+    """Return the yfinance module, importing it on first call"""
+    global _yf
+    if _yf is None:
+        import yfinance
+        _yf = yfinance
+    return _yf
+
+
+def _safe_sum(df: pd.DataFrame, col: str) -> int:
+    """
+    NaN-safe column total of an options chain
+
+    Reads the column's float64 buffer directly (no copy for float columns,
+    a single upcast for int ones) and lets np.nansum skip missing values,
+    so no fillna Series is allocated. Volume and open interest are contract
+    counts, so the total is returned as an int.
+    """
+    if df.empty or col not in df.columns:
+        return 0
+    return int(np.nansum(df[col].to_numpy(dtype=np.float64, na_value=np.nan, copy=False)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Shared by every service instance, since the limit is Yahoo's, not ours
+_yahoo_bucket = TokenBucket(_YAHOO_REQUESTS_PER_SECOND, _YAHOO_BURST)
+
 
 class OptionsFlowService:
     """Service for fetching and analyzing options flow data"""
@@ -27,20 +173,106 @@ class OptionsFlowService:
             "User-Agent": "TradeMaster Pro trademasterpro@example.com"
         }
         self.cache_ttl_seconds = 60 * 60 * 6
-        self._cache: Dict[str, Tuple[datetime, Dict]] = {}
+        # LRU of ticker -> (monotonic expiry, result), capped at _CACHE_MAXSIZE
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._disk_cache_path = self._init_disk_cache(_DISK_CACHE_PATH)
+        # LRU of ticker -> (monotonic expiry, yf.Ticker, option expiration
+        # dates), capped at _CACHE_MAXSIZE and guarded by _cache_lock
+        self._ticker_cache: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Upstream fetches currently running, keyed by ticker
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.cached_dedupe = 0
+
+    def _get_cached(self, ticker: str, count: bool = True, disk: bool = True) -> Optional[Dict]:
+        with self._cache_lock:
+            entry = self._cache.get(ticker)
+            if entry and time.monotonic() >= entry[0]:
+                del self._cache[ticker]
+                entry = None
+            if entry:
+                self._cache.move_to_end(ticker)
+
+        if not entry and disk:
+            # SQLite is read outside the lock so memory hits never queue behind it
+            entry = self._read_disk_cache(ticker)
+            if entry:
+                with self._cache_lock:
+                    self._cache[ticker] = entry
+                    self._cache.move_to_end(ticker)
+                    while len(self._cache) > _CACHE_MAXSIZE:
+                        self._cache.popitem(last=False)
+
+        if count:
+            self._count_lookup(entry is not None)
+        return entry[1] if entry else None
+
+    def _count_lookup(self, hit: bool) -> None:
+        with self._cache_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
 
-    def _get_cached(self, ticker: str) -> Optional[Dict]:
-        entry = self._cache.get(ticker)
-        if not entry:
+    def _set_cached(self, ticker: str, data: Dict) -> None:
+        with self._cache_lock:
+            self._cache[ticker] = (time.monotonic() + self.cache_ttl_seconds, data)
+            self._cache.move_to_end(ticker)
+            while len(self._cache) > _CACHE_MAXSIZE:
+                self._cache.popitem(last=False)
+        self._write_disk_cache(ticker, data)
+
+    @staticmethod
+    def _init_disk_cache(path: str) -> Optional[str]:
+        """Create the on-disk cache table; returns None if unavailable"""
+        if not path:
             return None
-        expires_at, data = entry
-        if datetime.now() >= expires_at:
-            self._cache.pop(ticker, None)
+        try:
+            with closing(sqlite3.connect(path)) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS options_cache ("
+                    "ticker TEXT PRIMARY KEY, fetched_at REAL, payload TEXT)"
+                )
+            return path
+        except Exception as e:
+            logger.warning(f"Options disk cache disabled ({path}): {str(e)}")
             return None
-        return data
 
-    def _set_cached(self, ticker: str, data: Dict) -> None:
-        self._cache[ticker] = (datetime.now() + timedelta(seconds=self.cache_ttl_seconds), data)
+    def _read_disk_cache(self, ticker: str) -> Optional[Tuple[float, Dict]]:
+        """Load a still-fresh entry as (monotonic expiry, data)"""
+        if not self._disk_cache_path:
+            return None
+        try:
+            with closing(sqlite3.connect(self._disk_cache_path)) as conn:
+                row = conn.execute(
+                    "SELECT fetched_at, payload FROM options_cache WHERE ticker = ?", (ticker,)
+                ).fetchone()
+        except Exception as e:
+            logger.debug(f"Options disk cache read failed for {ticker}: {str(e)}")
+            return None
+        if not row:
+            return None
+
+        # Wall-clock age, since monotonic time does not survive a restart
+        remaining = self.cache_ttl_seconds - (time.time() - row[0])
+        if remaining <= 0:
+            return None
+        return time.monotonic() + remaining, json.loads(row[1])
+
+    def _write_disk_cache(self, ticker: str, data: Dict) -> None:
+        if not self._disk_cache_path:
+            return
+        try:
+            with closing(sqlite3.connect(self._disk_cache_path)) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO options_cache (ticker, fetched_at, payload) VALUES (?, ?, ?)",
+                    (ticker, time.time(), json.dumps(data))
+                )
+        except Exception as e:
+            logger.debug(f"Options disk cache write failed for {ticker}: {str(e)}")
 
     def get_options_activity(self, ticker: str) -> Dict:
         """
@@ -52,28 +284,70 @@ class OptionsFlowService:
         Returns:
             Dict with options flow metrics
         """
-        try:
-            logger.info(f"Fetching options activity for {ticker}")
+        cached = self._get_cached(ticker)
+        if cached:
+            return cached
+        return self._fetch_options_activity(ticker)
 
-            cached = self._get_cached(ticker)
+    def _fetch_options_activity(self, ticker: str) -> Dict:
+        """
+        Fetch options activity for one ticker, coalescing concurrent callers
+
+        The first caller for a ticker runs the upstream fetch; callers that
+        arrive while it is in flight wait on the same Future instead of
+        issuing a duplicate Yahoo request.
+        """
+        with self._inflight_lock:
+            # Re-check memory only: another caller may have just finished
+            # this ticker, and the disk was already consulted by our caller
+            cached = self._get_cached(ticker, count=False, disk=False)
             if cached:
                 return cached
+            pending = self._inflight.get(ticker)
+            if pending is None:
+                future: Future = Future()
+                self._inflight[ticker] = future
+            else:
+                self.cached_dedupe += 1
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            result = self._load_options_activity(ticker)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(ticker, None)
+
+    def _load_options_activity(self, ticker: str) -> Dict:
+        """Fetch, summarize and cache options activity for one ticker"""
+        try:
+            logger.info(f"Fetching options activity for {ticker}")
 
             options_data = self._get_yfinance_options_data(ticker)
             if not options_data:
                 return self._get_default_options_data(ticker)
 
+            # Computed once and shared by the sentiment and signal helpers
+            pc_ratio = self._calculate_pc_ratio(options_data)
+            signal = self._generate_options_signal(options_data, pc_ratio)
+
             result = {
                 "ticker": ticker,
                 "call_volume": options_data["call_volume"],
                 "put_volume": options_data["put_volume"],
                 "total_volume": options_data["call_volume"] + options_data["put_volume"],
-                "put_call_ratio": self._calculate_pc_ratio(options_data),
+                "put_call_ratio": pc_ratio,
                 "call_open_interest": options_data["call_oi"],
                 "put_open_interest": options_data["put_oi"],
                 "unusual_activity": options_data["unusual_activity"],
-                "flow_sentiment": self._calculate_flow_sentiment(options_data),
-                "signal": self._generate_options_signal(options_data),
+                "flow_sentiment": self._calculate_flow_sentiment(options_data, pc_ratio).name,
+                "signal": signal.name if signal else None,
                 "large_trades": options_data["large_trades"]
             }
             self._set_cached(ticker, result)
@@ -85,24 +359,31 @@ class OptionsFlowService:
 
     def _get_yfinance_options_data(self, ticker: str) -> Optional[Dict]:
         try:
-            stock = yf.Ticker(ticker)
-            expirations = stock.options or []
+            stock, expirations = self._get_expirations(ticker)
             if not expirations:
                 return None
 
             expiry = expirations[0]
-            chain = stock.option_chain(expiry)
+            try:
+                _yahoo_bucket.acquire()
+                chain = stock.option_chain(expiry)
+            except Exception:
+                # The cached expiry may have rolled off; re-probe next time
+                with self._cache_lock:
+                    self._ticker_cache.pop(ticker, None)
+                raise
             calls = chain.calls
             puts = chain.puts
 
-            call_volume = float(calls["volume"].fillna(0).sum()) if not calls.empty else 0.0
-            put_volume = float(puts["volume"].fillna(0).sum()) if not puts.empty else 0.0
-            call_oi = float(calls["openInterest"].fillna(0).sum()) if not calls.empty else 0.0
-            put_oi = float(puts["openInterest"].fillna(0).sum()) if not puts.empty else 0.0
+            call_volume = _safe_sum(calls, "volume")
+            put_volume = _safe_sum(puts, "volume")
+            call_oi = _safe_sum(calls, "openInterest")
+            put_oi = _safe_sum(puts, "openInterest")
 
-            unusual_activity = False
-            if (call_oi + put_oi) > 0:
-                unusual_activity = (call_volume + put_volume) > 2 * (call_oi + put_oi)
+            # Unusual activity: volume above twice the open interest
+            # (integer counts, so no float arithmetic)
+            total_oi2 = (call_oi + put_oi) * 2
+            unusual_activity = total_oi2 > 0 and (call_volume + put_volume) > total_oi2
 
             return {
                 "call_volume": call_volume,
@@ -116,6 +397,34 @@ class OptionsFlowService:
             logger.warning(f"Options chain unavailable for {ticker}: {str(e)}")
             return None
 
+    def _get_expirations(self, ticker: str) -> Tuple[Any, Tuple[str, ...]]:
+        """
+        yf.Ticker and its option expiry dates, cached for _EXPIRY_TTL_SECONDS
+
+        The Ticker object itself is reused: it keeps the expiry map from the
+        probe, so a later option_chain(expiry) is a single Yahoo request
+        instead of re-downloading the expirations first.
+        """
+        with self._cache_lock:
+            entry = self._ticker_cache.get(ticker)
+            if entry and time.monotonic() >= entry[0]:
+                del self._ticker_cache[ticker]
+                entry = None
+            if entry:
+                self._ticker_cache.move_to_end(ticker)
+                return entry[1], entry[2]
+
+        stock = _yfinance().Ticker(ticker)
+        _yahoo_bucket.acquire()
+        expirations = tuple(stock.options or ())
+        if expirations:
+            with self._cache_lock:
+                self._ticker_cache[ticker] = (time.monotonic() + _EXPIRY_TTL_SECONDS, stock, expirations)
+                self._ticker_cache.move_to_end(ticker)
+                while len(self._ticker_cache) > _CACHE_MAXSIZE:
+                    self._ticker_cache.popitem(last=False)
+        return stock, expirations
+
     def _calculate_pc_ratio(self, data: Dict) -> float:
         """
         Calculate Put/Call ratio
@@ -131,144 +440,31 @@ class OptionsFlowService:
 
         return data["put_volume"] / call_vol
 
-    def _calculate_flow_sentiment(self, data: Dict) -> str:
+    def _calculate_flow_sentiment(self, data: Dict, pc_ratio: Optional[float] = None) -> FlowSentiment:
         """Calculate overall options flow sentiment"""
-        pc_ratio = self._calculate_pc_ratio(data)
-        unusual = data["unusual_activity"]
-
-        if pc_ratio < 0.5 and unusual:
-            return "VERY_BULLISH"
-        elif pc_ratio < 0.7:
-            return "BULLISH"
-        elif pc_ratio > 1.5 and unusual:
-            return "VERY_BEARISH"
-        elif pc_ratio > 1.0:
-            return "BEARISH"
-        else:
-            return "NEUTRAL"
-
-    def _generate_options_signal(self, data: Dict) -> Optional[str]:
-        """Generate trading signal based on options flow"""
-        pc_ratio = self._calculate_pc_ratio(data)
-        call_vol = data["call_volume"]
-        put_vol = data["put_volume"]
-        unusual = data["unusual_activity"]
-
-        # Unusual call buying (bullish)
-        if unusual and pc_ratio < 0.5 and call_vol > 1000:
-            return "UNUSUAL_CALL_ACTIVITY"
-
-        # Unusual put buying (bearish)
-        elif unusual and pc_ratio > 1.5 and put_vol > 1000:
-            return "UNUSUAL_PUT_ACTIVITY"
+        if pc_ratio is None:
+            pc_ratio = self._calculate_pc_ratio(data)
 
-        # Heavy call volume (bullish)
-        elif pc_ratio < 0.6 and call_vol > 5000:
-            return "HEAVY_CALL_VOLUME"
+        # Row: unusual activity flag, column: put/call band
+        return _SENTIMENT_LABELS[bool(data["unusual_activity"])][bisect_left(_SENTIMENT_THRESHOLDS, pc_ratio)]
 
-        # Heavy put volume (bearish)
-        elif pc_ratio > 1.2 and put_vol > 5000:
-            return "HEAVY_PUT_VOLUME"
+    def _generate_options_signal(self, data: Dict, pc_ratio: Optional[float] = None) -> Optional[Signal]:
+        """Generate trading signal based on options flow"""
+        if pc_ratio is None:
+            pc_ratio = self._calculate_pc_ratio(data)
 
-        return None
+        band = bisect_left(_SIGNAL_THRESHOLDS, pc_ratio)
 
-    def _get_mock_options_data(self, ticker: str) -> Dict:
-        """
-        Mock options data - replace with yfinance or Unusual Whales API
-
-        Real implementation:
-        ```python
-        import yfinance as yf
-        stock = yf.Ticker(ticker)
-        options = stock.option_chain()
-        calls = options.calls
-        puts = options.puts
-
-        call_volume = calls['volume'].sum()
-        put_volume = puts['volume'].sum()
-        call_oi = calls['openInterest'].sum()
-        put_oi = puts['openInterest'].sum()
-
-        # Detect unusual activity: volume > 2x open interest
-        unusual = (call_volume + put_volume) > 2 * (call_oi + put_oi)
-        ```
-        """
+        # Bullish bands look at call volume, bearish bands at put volume
+        volume = data["call_volume"] if band < 2 else data["put_volume"]
+        tier = bisect_left(_SIGNAL_VOLUME_TIERS, volume)
 
-        # Simulate options flow based on ticker hash
-        hash_val = sum(ord(c) for c in ticker) % 10
-
-        if hash_val > 7:  # 20% chance - unusual call activity (bullish)
-            call_volume = 15000
-            put_volume = 3000
-            call_oi = 50000
-            put_oi = 20000
-            unusual_activity = True
-            large_trades = [
-                {
-                    "type": "CALL",
-                    "strike": 150,
-                    "expiry": "2025-02-21",
-                    "volume": 5000,
-                    "premium": 8.50,
-                    "total_value": 4250000
-                },
-                {
-                    "type": "CALL",
-                    "strike": 155,
-                    "expiry": "2025-02-21",
-                    "volume": 3000,
-                    "premium": 6.25,
-                    "total_value": 1875000
-                }
-            ]
-        elif hash_val < 3:  # 30% chance - unusual put activity (bearish)
-            call_volume = 2000
-            put_volume = 12000
-            call_oi = 15000
-            put_oi = 40000
-            unusual_activity = True
-            large_trades = [
-                {
-                    "type": "PUT",
-                    "strike": 140,
-                    "expiry": "2025-02-21",
-                    "volume": 4000,
-                    "premium": 7.75,
-                    "total_value": 3100000
-                }
-            ]
-        else:  # 50% chance - normal activity
-            call_volume = 5000
-            put_volume = 4000
-            call_oi = 30000
-            put_oi = 25000
-            unusual_activity = False
-            large_trades = []
-
-        return {
-            "call_volume": call_volume,
-            "put_volume": put_volume,
-            "call_oi": call_oi,
-            "put_oi": put_oi,
-            "unusual_activity": unusual_activity,
-            "large_trades": large_trades
-        }
+        return _SIGNAL_TABLE[band][bool(data["unusual_activity"])][tier]
 
     def _get_default_options_data(self, ticker: str) -> Dict:
         """Return default data when API fails"""
-        return {
-            "ticker": ticker,
-            "call_volume": 0,
-            "put_volume": 0,
-            "total_volume": 0,
-            "put_call_ratio": 0,
-            "call_open_interest": 0,
-            "put_open_interest": 0,
-            "unusual_activity": False,
-            "flow_sentiment": "UNKNOWN",
-            "signal": None,
-            "large_trades": []
-        }
+        # Fresh list per result, since callers may append to it
+        return {**_DEFAULT_OPTIONS_DATA, "ticker": ticker, "large_trades": []}
 
     def get_options_score(self, ticker: str) -> int:
         """
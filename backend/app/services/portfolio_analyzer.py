@@ -14,15 +14,67 @@ Analyzes user portfolio for:
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Optional
 import numpy as np
 import pandas as pd
+from cachetools import TTLCache
 from datetime import datetime, timedelta
-from .yfinance_service import get_yfinance_service
+from .yfinance_service import get_yfinance_service, normalize_ticker
+from .macro_analyzer import get_macro_analyzer
 from .finnhub_service import get_finnhub_service
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for the data-layer fetches of every portfolio analysis
+_FETCH_WORKERS = 8
+_EXECUTOR = ThreadPoolExecutor(max_workers=_FETCH_WORKERS, thread_name_prefix="portfolio")
+_TRADING_DAYS = 252
+
+# Risk-free rate: FRED 3-month T-bill yield (percent), refreshed daily;
+# the constant is used when FRED is unavailable
+_RISK_FREE_SERIES = "DGS3MO"
+_RISK_FREE_TTL = 86400
+_FALLBACK_RISK_FREE_RATE = 4.0
+
+# Exchange suffix -> trading currency; indices below are EUR-denominated
+_EUR_INDEX_PREFIXES = ("^OMX", "^STOXX", "^GDAXI")
+_SUFFIX_CURRENCIES = (
+    (".HE", "EUR"),
+    (".ST", "SEK"),
+    (".OL", "NOK"),
+    (".CO", "DKK"),
+    (".L", "GBP"),
+)
+
+
+@lru_cache(maxsize=4096)
+def _guess_currency(ticker: str) -> str:
+    """Guess a ticker's trading currency from its exchange suffix"""
+    if not ticker:
+        return "EUR"
+    normalized = str(ticker).upper()
+    if normalized.startswith(_EUR_INDEX_PREFIXES):
+        return "EUR"
+    for suffix, currency in _SUFFIX_CURRENCIES:
+        if normalized.endswith(suffix):
+            return currency
+    return "USD"
+
+
+@dataclass(slots=True)
+class PositionEUR:
+    """EUR-converted figures of a position, as used by the metric helpers"""
+    ticker: str
+    sector: str
+    beta: float
+    current_value: float
+    gain_loss: float
+    cost_basis: float
+    gain_loss_pct: float
+
 
 class PortfolioHealthAnalyzer:
     """Analyze portfolio health and provide recommendations"""
@@ -30,6 +82,11 @@ class PortfolioHealthAnalyzer:
     def __init__(self):
         self.yfinance = get_yfinance_service()
         self.finnhub = get_finnhub_service()
+        # currency -> EUR conversion factor, refreshed every 5 minutes
+        self._fx_cache = TTLCache(maxsize=64, ttl=300)
+        # frozenset(currencies) -> full rates mapping, same lifetime
+        self._fx_memo = TTLCache(maxsize=256, ttl=300)
+        self._risk_free_cache = TTLCache(maxsize=1, ttl=_RISK_FREE_TTL)
         logger.info("PortfolioHealthAnalyzer initialized")
 
     def analyze_portfolio(self, holdings: List[Dict]) -> Dict:
@@ -42,189 +99,229 @@ class PortfolioHealthAnalyzer:
         Returns:
             Comprehensive portfolio analysis
         """
-        try:
-            if not holdings:
-                return self._empty_portfolio_response()
-
-            # Get current data for all holdings
-            positions = []
-            total_value = 0
+        if not holdings:
+            return self._empty_portfolio_response()
 
-            for holding in holdings:
-                ticker = holding['ticker']
-                shares = holding['shares']
-                avg_cost = holding.get('avg_cost', 0)
+        # Get current data for all holdings: quotes in one batch, then
+        # fundamentals for the quoted tickers in parallel
+        tickers = [holding['ticker'] for holding in holdings]
+        try:
+            quotes = self.yfinance.get_multiple_quotes(tickers, allow_external=False)
+        except Exception as e:
+            logger.warning(f"Could not fetch portfolio quotes: {str(e)}")
+            quotes = {}
+        quoted = list(dict.fromkeys(t for t in tickers if quotes.get(t)))
+        fundamentals_map = {}
+        if quoted:
+            fundamentals_map = dict(zip(quoted, _EXECUTOR.map(self._fetch_fundamentals, quoted)))
 
-                # Get current price
-                quote = self.yfinance.get_quote(ticker, allow_external=False)
-                if not quote:
-                    continue
+        positions = []
+        currencies = set()
+        total_value = 0
 
-                current_price = quote.get('c', 0)
-                current_value = current_price * shares
-                cost_basis = avg_cost * shares
-                gain_loss = current_value - cost_basis if cost_basis > 0 else 0
-                gain_loss_pct = (gain_loss / cost_basis * 100) if cost_basis > 0 else 0
-
-                # Get fundamentals
-                fundamentals = self.yfinance.get_fundamentals(ticker, allow_external=False)
-                holding_currency = holding.get('currency')
-                currency = holding_currency or (fundamentals.get('currency') if fundamentals else None) or 'EUR'
-
-                # Extract dividend info
-                dividend_yield = fundamentals.get('dividendYield', 0) if fundamentals else 0
-                dividend_yield = dividend_yield if dividend_yield else 0
-                expected_annual_dividend = current_value * dividend_yield
-
-                position = {
-                    'ticker': ticker,
-                    'shares': shares,
-                    'current_price': current_price,
-                    'current_value': current_value,
-                    'cost_basis': cost_basis,
-                    'gain_loss': gain_loss,
-                    'gain_loss_pct': gain_loss_pct,
-                    'name': fundamentals.get('shortName', ticker) if fundamentals else ticker,
-                    'currency': currency,
-                    'sector': fundamentals.get('sector', 'Unknown') if fundamentals else 'Unknown',
-                    'beta': fundamentals.get('beta', 1) if fundamentals else 1,
-                    'dividend_yield': round(dividend_yield * 100, 2) if dividend_yield else 0,
-                    'expected_annual_dividend': round(expected_annual_dividend, 2)
-                }
+        for holding in holdings:
+            ticker = holding['ticker']
+            shares = holding['shares']
+            avg_cost = holding.get('avg_cost', 0)
 
-                positions.append(position)
-                total_value += current_value
-
-            # FX conversion (EUR) for mixed-currency portfolios
-            currencies = {p.get('currency') or 'EUR' for p in positions}
-            fx_rates = self._get_fx_rates(list(currencies))
-            positions_calc = []
-            total_value_eur = 0.0
-            total_gain_loss_eur = 0.0
-            total_cost_basis_eur = 0.0
-            for p in positions:
-                currency = p.get('currency') or 'EUR'
-                fx_rate = fx_rates.get(currency, 1.0)
-                current_value_eur = p['current_value'] * fx_rate
-                gain_loss_eur = p['gain_loss'] * fx_rate
-                cost_basis_eur = p['cost_basis'] * fx_rate
-                total_value_eur += current_value_eur
-                total_gain_loss_eur += gain_loss_eur
-                total_cost_basis_eur += cost_basis_eur
-                p['current_value_eur'] = current_value_eur
-                p['gain_loss_eur'] = gain_loss_eur
-                p['cost_basis_eur'] = cost_basis_eur
-                p_calc = dict(p)
-                p_calc['current_value'] = current_value_eur
-                p_calc['gain_loss'] = gain_loss_eur
-                p_calc['cost_basis'] = cost_basis_eur
-                positions_calc.append(p_calc)
-
-            total_gain_loss_pct_eur = (total_gain_loss_eur / total_cost_basis_eur * 100) if total_cost_basis_eur > 0 else 0
-
-            # Calculate metrics (use EUR-converted values for weights)
-            risk_score = self._calculate_risk_score(positions_calc, total_value_eur if total_value_eur else total_value)
-            diversification = self._analyze_diversification(positions_calc, total_value_eur if total_value_eur else total_value)
-            rebalancing = self._get_rebalancing_recommendations(positions_calc, total_value_eur if total_value_eur else total_value)
+            # Get current price
+            quote = quotes.get(ticker)
+            if not quote:
+                continue
 
-            # NEW: Advanced analytics
-            correlation_matrix = self._calculate_correlation_matrix([p['ticker'] for p in positions])
-            sharpe_ratio = self._calculate_sharpe_ratio(positions)
-            benchmark_comparison = self._compare_to_benchmark(positions_calc)
-            performance_metrics = self._calculate_performance_metrics(positions_calc, total_value_eur if total_value_eur else total_value)
+            current_price = quote.get('c', 0)
+            current_value = current_price * shares
+            cost_basis = avg_cost * shares
+            gain_loss = current_value - cost_basis if cost_basis > 0 else 0
+            gain_loss_pct = (gain_loss / cost_basis * 100) if cost_basis > 0 else 0
+
+            # Get fundamentals
+            fundamentals = fundamentals_map.get(ticker)
+            holding_currency = holding.get('currency')
+            currency = holding_currency or (fundamentals.get('currency') if fundamentals else None) or 'EUR'
+
+            beta = fundamentals.get('beta') if fundamentals else None
+
+            # Extract dividend info
+            dividend_yield = fundamentals.get('dividendYield', 0) if fundamentals else 0
+            dividend_yield = dividend_yield if dividend_yield else 0
+            expected_annual_dividend = current_value * dividend_yield
+
+            position = {
+                'ticker': ticker,
+                'shares': shares,
+                'current_price': current_price,
+                'current_value': current_value,
+                'cost_basis': cost_basis,
+                'gain_loss': gain_loss,
+                'gain_loss_pct': gain_loss_pct,
+                'name': fundamentals.get('shortName', ticker) if fundamentals else ticker,
+                'currency': currency,
+                'sector': (fundamentals.get('sector') if fundamentals else None) or 'Unknown',
+                'beta': beta if beta is not None else 1,
+                'dividend_yield': round(dividend_yield * 100, 2) if dividend_yield else 0,
+                'expected_annual_dividend': round(expected_annual_dividend, 2)
+            }
 
-            health_score = self._calculate_health_score(risk_score, diversification)
+            positions.append(position)
+            currencies.add(currency)
+            total_value += current_value
 
-            # Calculate total gain/loss
-            total_gain_loss = sum([p['gain_loss'] for p in positions])
-            total_cost_basis = sum([p['cost_basis'] for p in positions if p['cost_basis'] > 0])
-            total_gain_loss_pct = (total_gain_loss / total_cost_basis * 100) if total_cost_basis > 0 else 0
+        if not positions:
+            return self._empty_portfolio_response()
 
-            # Convert sectors dict to array for frontend
-            sector_breakdown = [
-                {'sector': sector, 'percentage': pct, 'count': 1}
-                for sector, pct in diversification['sectors'].items()
-            ]
+        # FX conversion (EUR) for mixed-currency portfolios: one
+        # (positions x [value, gain/loss, cost]) array scaled by the FX vector
+        fx_rates = self._get_fx_rates(list(currencies))
+        n = len(positions)
+        fx_vec = np.fromiter((fx_rates.get(p['currency'], 1.0) for p in positions), dtype=np.float64, count=n)
+        amounts = np.array(
+            [(p['current_value'], p['gain_loss'], p['cost_basis']) for p in positions],
+            dtype=np.float64
+        ).reshape(n, 3)
+        amounts_eur = amounts * fx_vec[:, None]
+        values_eur = amounts_eur[:, 0]
+        total_value_eur, total_gain_loss_eur, total_cost_basis_eur = amounts_eur.sum(axis=0).tolist()
+
+        positions_calc = []
+        for p, (current_value_eur, gain_loss_eur, cost_basis_eur) in zip(positions, amounts_eur.tolist()):
+            p['current_value_eur'] = current_value_eur
+            p['gain_loss_eur'] = gain_loss_eur
+            p['cost_basis_eur'] = cost_basis_eur
+            positions_calc.append(PositionEUR(
+                p['ticker'], p['sector'], p['beta'],
+                current_value_eur, gain_loss_eur, cost_basis_eur, p['gain_loss_pct']
+            ))
+
+        total_gain_loss_pct_eur = (total_gain_loss_eur / total_cost_basis_eur * 100) if total_cost_basis_eur > 0 else 0
+
+        # Position weights (% of EUR-converted value), computed once and
+        # shared by the metrics below and the positions payload
+        weight_base = total_value_eur if total_value_eur else total_value
+        if not weight_base:
+            return self._empty_portfolio_response()
+        weights_pct = values_eur * (100.0 / weight_base)
+        position_weights = np.round(weights_pct, 2).tolist() if total_value_eur > 0 else [0] * n
+
+        # Calculate metrics (use EUR-converted values for weights)
+        risk_score = self._calculate_risk_score(positions_calc, weights_pct)
+        diversification = self._analyze_diversification(positions_calc, weights_pct)
+        rebalancing = self._get_rebalancing_recommendations(positions_calc, weights_pct)
+
+        # NEW: Advanced analytics. Only the return history and SPY benchmark
+        # fetches touch the data layer; they are independent, so they overlap
+        position_tickers = [p['ticker'] for p in positions]
+        returns_future = _EXECUTOR.submit(self._get_returns_frame, position_tickers)
+        benchmark_future = _EXECUTOR.submit(self._compare_to_benchmark, positions_calc)
+        returns_df = returns_future.result()
+        benchmark_comparison = benchmark_future.result()
+
+        correlation_matrix = self._calculate_correlation_matrix(position_tickers, returns_df)
+        sharpe_ratio = self._calculate_sharpe_ratio(positions_calc, returns_df)
+        performance_metrics = self._calculate_performance_metrics(positions_calc, total_value_eur if total_value_eur else total_value)
+
+        health_score = self._calculate_health_score(risk_score, diversification)
+
+        # Calculate total gain/loss
+        total_gain_loss = sum(p['gain_loss'] for p in positions)
+        total_cost_basis = sum(p['cost_basis'] for p in positions if p['cost_basis'] > 0)
+        total_gain_loss_pct = (total_gain_loss / total_cost_basis * 100) if total_cost_basis > 0 else 0
+
+        total_expected_dividend = sum(p.get('expected_annual_dividend', 0) for p in positions)
+
+        # Convert sectors dict to array for frontend
+        sector_breakdown = [
+            {'sector': sector, 'percentage': pct, 'count': 1}
+            for sector, pct in diversification['sectors'].items()
+        ]
 
-            return {
-                'total_value': round(total_value, 2),
-                'total_positions': len(positions),
-                'health_score': health_score,
-                'total_gain_loss': round(total_gain_loss, 2),
-                'total_gain_loss_pct': round(total_gain_loss_pct, 2),
-                'total_value_eur': round(total_value_eur, 2),
-                'total_gain_loss_eur': round(total_gain_loss_eur, 2),
-                'total_gain_loss_pct_eur': round(total_gain_loss_pct_eur, 2),
-                'reporting_currency': 'EUR',
-                'fx_rates': fx_rates,
-                'risk_analysis': {
-                    'overall_risk': risk_score['level'],
-                    'concentration_risk': risk_score['concentration']['max_position'],
-                    'volatility_risk': risk_score['volatility']['weighted_beta'],
-                    'losses_risk': risk_score['losses']['losing_positions'],
-                    'total_risk_score': risk_score['score']
-                },
-                'diversification': {
-                    'score': diversification['score'],
-                    'status': diversification['level'],
-                    'sector_breakdown': sector_breakdown
-                },
-                'rebalancing': rebalancing['recommendations'],
-                'positions': [
-                    {
-                        'ticker': p['ticker'],
-                        'name': p.get('name'),
-                        'shares': p['shares'],
-                        'entry_price': p.get('cost_basis', 0) / p['shares'] if p['shares'] > 0 else 0,
-                        'current_price': p['current_price'],
-                        'value': round(p['current_value'], 2),
-                        'value_eur': round(p.get('current_value_eur', p['current_value']), 2),
-                        'gain_loss': round(p['gain_loss'], 2),
-                        'gain_loss_eur': round(p.get('gain_loss_eur', p['gain_loss']), 2),
-                        'gain_loss_pct': round(p['gain_loss_pct'], 2),
-                        'weight': round((p.get('current_value_eur', p['current_value']) / total_value_eur * 100) if total_value_eur > 0 else 0, 2),
-                        'sector': p['sector'],
-                        'currency': p.get('currency'),
-                        'dividend_yield': p.get('dividend_yield', 0),
-                        'expected_annual_dividend': p.get('expected_annual_dividend', 0),
-                    }
-                    for p in positions
-                ],
-                # Dividend analysis
-                'dividends': {
-                    'total_expected_annual': round(sum(p.get('expected_annual_dividend', 0) for p in positions), 2),
-                    'portfolio_yield': round((sum(p.get('expected_annual_dividend', 0) for p in positions) / total_value_eur * 100) if total_value_eur > 0 else 0, 2),
-                    'dividend_paying_positions': len([p for p in positions if p.get('dividend_yield', 0) > 0]),
-                },
-                # NEW: Advanced analytics
-                'correlation': correlation_matrix,
-                'sharpe_ratio': sharpe_ratio,
-                'benchmark_comparison': benchmark_comparison,
-                'performance': performance_metrics,
-                'summary': self._generate_summary(health_score, risk_score, diversification),
-                'alerts': self._generate_alerts(positions, risk_score, diversification)
-            }
+        return {
+            'total_value': round(total_value, 2),
+            'total_positions': len(positions),
+            'health_score': health_score,
+            'total_gain_loss': round(total_gain_loss, 2),
+            'total_gain_loss_pct': round(total_gain_loss_pct, 2),
+            'total_value_eur': round(total_value_eur, 2),
+            'total_gain_loss_eur': round(total_gain_loss_eur, 2),
+            'total_gain_loss_pct_eur': round(total_gain_loss_pct_eur, 2),
+            'reporting_currency': 'EUR',
+            'fx_rates': fx_rates,
+            'risk_analysis': {
+                'overall_risk': risk_score['level'],
+                'concentration_risk': risk_score['concentration']['max_position'],
+                'volatility_risk': risk_score['volatility']['weighted_beta'],
+                'losses_risk': risk_score['losses']['losing_positions'],
+                'total_risk_score': risk_score['score']
+            },
+            'diversification': {
+                'score': diversification['score'],
+                'status': diversification['level'],
+                'sector_breakdown': sector_breakdown
+            },
+            'rebalancing': rebalancing['recommendations'],
+            'positions': [
+                {
+                    'ticker': p['ticker'],
+                    'name': p.get('name'),
+                    'shares': p['shares'],
+                    'entry_price': p.get('cost_basis', 0) / p['shares'] if p['shares'] > 0 else 0,
+                    'current_price': p['current_price'],
+                    'value': round(p['current_value'], 2),
+                    'value_eur': round(p.get('current_value_eur', p['current_value']), 2),
+                    'gain_loss': round(p['gain_loss'], 2),
+                    'gain_loss_eur': round(p.get('gain_loss_eur', p['gain_loss']), 2),
+                    'gain_loss_pct': round(p['gain_loss_pct'], 2),
+                    'weight': weight,
+                    'sector': p['sector'],
+                    'currency': p.get('currency'),
+                    'dividend_yield': p.get('dividend_yield', 0),
+                    'expected_annual_dividend': p.get('expected_annual_dividend', 0),
+                }
+                for p, weight in zip(positions, position_weights)
+            ],
+            # Dividend analysis
+            'dividends': {
+                'total_expected_annual': round(total_expected_dividend, 2),
+                'portfolio_yield': round((total_expected_dividend / total_value_eur * 100) if total_value_eur > 0 else 0, 2),
+                'dividend_paying_positions': sum(1 for p in positions if p.get('dividend_yield', 0) > 0),
+            },
+            # NEW: Advanced analytics
+            'correlation': correlation_matrix,
+            'sharpe_ratio': sharpe_ratio,
+            'benchmark_comparison': benchmark_comparison,
+            'performance': performance_metrics,
+            'summary': self._generate_summary(health_score, risk_score, diversification),
+            'alerts': self._generate_alerts(positions, risk_score, diversification)
+        }
 
+    def _fetch_fundamentals(self, ticker: str) -> Optional[Dict]:
+        """Cached fundamentals for a ticker, or None if the lookup fails"""
+        try:
+            return self.yfinance.get_fundamentals(ticker, allow_external=False)
         except Exception as e:
-            logger.error(f"Error analyzing portfolio: {str(e)}")
-            return self._empty_portfolio_response()
+            logger.warning(f"Could not fetch fundamentals for {ticker}: {str(e)}")
+            return None
 
-    def _calculate_risk_score(self, positions: List[Dict], total_value: float) -> Dict:
+    def _calculate_risk_score(self, positions: List[PositionEUR], weights_pct: Optional[np.ndarray]) -> Dict:
         """Calculate portfolio risk metrics"""
-        if not positions or total_value == 0:
+        if not positions or weights_pct is None:
             return {'score': 50, 'level': 'MEDIUM', 'factors': []}
 
+        n = len(positions)
+        betas = np.fromiter((p.beta for p in positions), dtype=np.float64, count=n)
+        gains = np.fromiter((p.gain_loss for p in positions), dtype=np.float64, count=n)
+
         # Concentration risk
-        max_position_pct = max([p['current_value'] / total_value * 100 for p in positions])
+        max_position_pct = float(weights_pct.max())
         concentration_risk = 'HIGH' if max_position_pct > 25 else 'MEDIUM' if max_position_pct > 15 else 'LOW'
 
         # Volatility risk (beta-weighted)
-        weighted_beta = sum([p['beta'] * (p['current_value'] / total_value) for p in positions])
+        weighted_beta = float(weights_pct @ betas) / 100
         volatility_risk = 'HIGH' if weighted_beta > 1.3 else 'MEDIUM' if weighted_beta > 0.8 else 'LOW'
 
         # Unrealized losses
-        losers = [p for p in positions if p['gain_loss'] < 0]
-        loss_risk = 'HIGH' if len(losers) > len(positions) / 2 else 'MEDIUM' if losers else 'LOW'
+        losers = int(np.count_nonzero(gains < 0))
+        loss_risk = 'HIGH' if losers > n / 2 else 'MEDIUM' if losers else 'LOW'
 
         # Calculate overall risk score (0-100, lower is better)
         risk_factors = {
@@ -241,21 +338,17 @@ class PortfolioHealthAnalyzer:
             'level': risk_level,
             'concentration': {'level': concentration_risk, 'max_position': max_position_pct},
             'volatility': {'level': volatility_risk, 'weighted_beta': round(weighted_beta, 2)},
-            'losses': {'level': loss_risk, 'losing_positions': len(losers)},
+            'losses': {'level': loss_risk, 'losing_positions': losers},
             'factors': self._get_risk_factors(concentration_risk, volatility_risk, loss_risk)
         }
 
-    def _analyze_diversification(self, positions: List[Dict], total_value: float) -> Dict:
+    def _analyze_diversification(self, positions: List[PositionEUR], weights_pct: Optional[np.ndarray]) -> Dict:
         """Analyze portfolio diversification"""
-        if not positions:
+        if not positions or weights_pct is None:
             return {'score': 0, 'level': 'POOR', 'sectors': {}}
 
-        # Sector breakdown
-        sectors = {}
-        for p in positions:
-            sector = p['sector']
-            pct = (p['current_value'] / total_value * 100)
-            sectors[sector] = sectors.get(sector, 0) + pct
+        # Sector breakdown (sectors in first-seen order)
+        sectors = pd.Series(weights_pct, index=[p.sector for p in positions]).groupby(level=0, sort=False).sum().to_dict()
 
         # Number of sectors
         num_sectors = len(sectors)
@@ -278,49 +371,47 @@ class PortfolioHealthAnalyzer:
             'recommendations': self._get_diversification_tips(num_sectors, max_sector_pct, sectors)
         }
 
-    def _get_rebalancing_recommendations(self, positions: List[Dict], total_value: float) -> Dict:
+    def _get_rebalancing_recommendations(self, positions: List[PositionEUR], weights_pct: Optional[np.ndarray]) -> Dict:
         """Generate rebalancing recommendations"""
-        if not positions or total_value == 0:
+        if not positions or weights_pct is None:
             return {'needed': False, 'recommendations': []}
 
         recommendations = []
+        pcts = weights_pct.tolist()
 
         # Check for over-concentrated positions (>20% of portfolio)
-        for p in positions:
-            pct = (p['current_value'] / total_value * 100)
+        for p, pct in zip(positions, pcts):
             if pct > 20:
                 recommendations.append({
                     'action': 'TRIM',
-                    'ticker': p['ticker'],
+                    'ticker': p.ticker,
                     'current_pct': round(pct, 1),
                     'suggested_pct': 15.0,
                     'reason': f"Position is {pct:.1f}% of portfolio - reduce to 15% for better risk management"
                 })
 
         # Check for big losers (>25% down)
-        for p in positions:
-            pct = (p['current_value'] / total_value * 100)
-            if p['gain_loss_pct'] < -25:
+        for p, pct in zip(positions, pcts):
+            if p.gain_loss_pct < -25:
                 recommendations.append({
                     'action': 'REVIEW',
-                    'ticker': p['ticker'],
+                    'ticker': p.ticker,
                     'current_pct': round(pct, 1),
                     'suggested_pct': None,  # No specific target for review
-                    'loss_pct': round(p['gain_loss_pct'], 1),
-                    'reason': f"Down {abs(p['gain_loss_pct']):.1f}% - review fundamentals or cut losses"
+                    'loss_pct': round(p.gain_loss_pct, 1),
+                    'reason': f"Down {abs(p.gain_loss_pct):.1f}% - review fundamentals or cut losses"
                 })
 
         # Check for big winners (consider taking profits)
-        for p in positions:
-            pct = (p['current_value'] / total_value * 100)
-            if p['gain_loss_pct'] > 100 and pct > 15:
+        for p, pct in zip(positions, pcts):
+            if p.gain_loss_pct > 100 and pct > 15:
                 recommendations.append({
                     'action': 'TAKE_PROFITS',
-                    'ticker': p['ticker'],
+                    'ticker': p.ticker,
                     'current_pct': round(pct, 1),
                     'suggested_pct': round(pct * 0.7, 1),  # Suggest reducing by 30%
-                    'gain_pct': round(p['gain_loss_pct'], 1),
-                    'reason': f"Up {p['gain_loss_pct']:.1f}% - consider taking partial profits"
+                    'gain_pct': round(p.gain_loss_pct, 1),
+                    'reason': f"Up {p.gain_loss_pct:.1f}% - consider taking partial profits"
                 })
 
         return {
@@ -434,6 +525,11 @@ class PortfolioHealthAnalyzer:
         if not currencies:
             return {"EUR": 1.0}
 
+        key = frozenset(c for c in currencies if c)
+        memoized = self._fx_memo.get(key)
+        if memoized:
+            return dict(memoized)
+
         fx_pairs = {
             "USD": "EURUSD=X",
             "SEK": "EURSEK=X",
@@ -449,18 +545,59 @@ class PortfolioHealthAnalyzer:
         for currency in currencies:
             if not currency or currency == "EUR" or currency in rates:
                 continue
+            cached_rate = self._fx_cache.get(currency)
+            if cached_rate:
+                rates[currency] = cached_rate
+                continue
             pair = fx_pairs.get(currency)
             if not pair:
                 continue
-            quote = self.yfinance.get_quote(pair, allow_external=False)
+            try:
+                quote = self.yfinance.get_quote(pair, allow_external=False)
+            except Exception as e:
+                logger.warning(f"Could not fetch FX rate {pair}: {str(e)}")
+                continue
             rate = quote.get("c") if quote else None
             if rate and rate > 0:
                 # Pair is EURXXX, so 1 EUR = rate XXX -> convert XXX to EUR by dividing
                 rates[currency] = 1.0 / rate
+                self._fx_cache[currency] = rates[currency]
+
+        # Only memoize complete lookups so a failed pair is retried next call
+        if all(c in rates for c in key if c in fx_pairs):
+            self._fx_memo[key] = dict(rates)
 
         return rates
 
-    def _calculate_correlation_matrix(self, tickers: List[str]) -> Dict:
+    def _get_returns_frame(self, tickers: List[str], period: str = '3mo') -> pd.DataFrame:
+        """
+        Fetch daily returns for the given tickers in one batch.
+
+        Returns a DataFrame with one column per ticker that has more than
+        20 rows of history (empty if none do).
+        """
+        try:
+            history = self.yfinance.get_multiple_stocks(
+                tickers,
+                period=period,
+                allow_external=False
+            )
+        except Exception as e:
+            logger.warning(f"Could not fetch return history: {str(e)}")
+            history = {}
+
+        # Returns are taken per ticker before aligning, so exchange
+        # holidays don't punch NaN gaps into the neighbouring returns
+        returns_data = {
+            ticker: data['Close'].pct_change().dropna()
+            for ticker, data in (history or {}).items()
+            if data is not None and len(data) > 20
+        }
+        if not returns_data:
+            return pd.DataFrame()
+        return pd.concat(returns_data, axis=1)
+
+    def _calculate_correlation_matrix(self, tickers: List[str], returns_df: pd.DataFrame) -> Dict:
         """
         Calculate correlation matrix between portfolio positions
 
@@ -474,41 +611,22 @@ class PortfolioHealthAnalyzer:
                     'message': 'Need at least 2 positions for correlation analysis'
                 }
 
-            # Get 3 months of historical data for each ticker
-            returns_data = {}
-            for ticker in tickers:
-                try:
-                    data = self.yfinance.get_stock_data(
-                        ticker,
-                        period='3mo',
-                        allow_external=False
-                    )
-                    if data is not None and len(data) > 20:
-                        returns_data[ticker] = data['Close'].pct_change().dropna()
-                except Exception as e:
-                    logger.warning(f"Could not fetch data for {ticker}: {str(e)}")
-                    continue
-
-            if len(returns_data) < 2:
+            if returns_df.shape[1] < 2:
                 return {
                     'avg_correlation': 0,
                     'max_correlation': 0,
                     'message': 'Insufficient data for correlation analysis'
                 }
 
-            # Create returns dataframe
-            returns_df = pd.DataFrame(returns_data)
-
             # Calculate correlation matrix
             corr_matrix = returns_df.corr()
 
-            # Get average correlation (excluding diagonal)
-            mask = np.ones_like(corr_matrix, dtype=bool)
-            np.fill_diagonal(mask, 0)
-            avg_corr = corr_matrix.where(mask).mean().mean()
-
-            # Get max correlation (excluding diagonal)
-            max_corr = corr_matrix.where(mask).max().max()
+            # Average and max correlation over the upper triangle (excluding diagonal)
+            arr = corr_matrix.to_numpy()
+            i, j = np.triu_indices(arr.shape[0], k=1)
+            off_diagonal = arr[i, j]
+            avg_corr = np.nanmean(off_diagonal)
+            max_corr = np.nanmax(off_diagonal)
 
             # Assessment
             if avg_corr > 0.7:
@@ -533,22 +651,6 @@ class PortfolioHealthAnalyzer:
                 'message': 'Correlation analysis unavailable'
             }
 
-    def _guess_currency_from_ticker(self, ticker: str) -> str:
-        if not ticker:
-            return "EUR"
-        normalized = str(ticker).upper()
-        if normalized.endswith(".HE") or normalized.startswith("^OMX") or normalized.startswith("^STOXX") or normalized.startswith("^GDAXI"):
-            return "EUR"
-        if normalized.endswith(".ST"):
-            return "SEK"
-        if normalized.endswith(".OL"):
-            return "NOK"
-        if normalized.endswith(".CO"):
-            return "DKK"
-        if normalized.endswith(".L"):
-            return "GBP"
-        return "USD"
-
     def get_portfolio_performance_series(
         self,
         holdings: List[Dict],
@@ -574,22 +676,33 @@ class PortfolioHealthAnalyzer:
         for holding in holdings:
             currency = holding.get("currency")
             if not currency:
-                currency = self._guess_currency_from_ticker(holding.get("ticker", ""))
+                currency = _guess_currency(holding.get("ticker", ""))
             currencies.append(currency)
 
         fx_rates = self._get_fx_rates(list(set(currencies)))
 
-        # Fetch price history
-        data_map = self.yfinance.get_multiple_stocks(
+        # Fetch holdings and benchmark history concurrently
+        holdings_future = _EXECUTOR.submit(
+            self.yfinance.get_multiple_stocks,
             tickers,
             period=period,
             allow_external=False
         )
+        bench_future = _EXECUTOR.submit(
+            self.yfinance.get_multiple_stocks,
+            bench,
+            period=period,
+            allow_external=False
+        )
+        data_map = holdings_future.result()
+        bench_data = bench_future.result()
+
         if not data_map:
             return {"series": [], "benchmarks": bench, "message": "No data"}
 
-        # Build portfolio value series
-        series_list = []
+        # Build portfolio value series: one close-price frame times a
+        # per-ticker shares * FX multiplier (repeated tickers are summed)
+        multipliers = {}
         for holding in holdings:
             ticker = holding.get("ticker")
             shares = holding.get("shares", 0)
@@ -598,23 +711,30 @@ class PortfolioHealthAnalyzer:
             df = data_map.get(ticker)
             if df is None or df.empty or "Close" not in df.columns:
                 continue
-            currency = holding.get("currency") or self._guess_currency_from_ticker(ticker)
+            currency = holding.get("currency") or _guess_currency(ticker)
             fx_rate = fx_rates.get(currency, 1.0)
-            values = df["Close"] * float(shares) * fx_rate
-            series_list.append(values.rename(ticker))
+            multipliers[ticker] = multipliers.get(ticker, 0.0) + float(shares) * fx_rate
 
-        if not series_list:
+        if not multipliers:
             return {"series": [], "benchmarks": bench, "message": "No series"}
 
-        portfolio_df = pd.concat(series_list, axis=1, join="outer").sort_index().ffill().dropna()
-        portfolio_series = portfolio_df.sum(axis=1)
+        # Holdings on one trading calendar line up with an inner join; only
+        # fall back to outer join + ffill when some dates are missing
+        closes = {ticker: data_map[ticker]["Close"] for ticker in multipliers}
+        close = pd.concat(closes, axis=1, join="inner").sort_index()
+        aligned = (
+            not close.empty
+            and not close.isna().to_numpy().any()
+            and all(int((series.index >= close.index[0]).sum()) == len(close) for series in closes.values())
+        )
+        if not aligned:
+            close = pd.concat(closes, axis=1, join="outer").sort_index().ffill().dropna()
+        portfolio_series = pd.Series(
+            close.to_numpy() @ np.fromiter(multipliers.values(), dtype=np.float64, count=len(multipliers)),
+            index=close.index
+        )
 
         # Benchmarks
-        bench_data = self.yfinance.get_multiple_stocks(
-            bench,
-            period=period,
-            allow_external=False
-        )
         bench_series = {}
         if bench_data:
             for ticker in bench:
@@ -632,15 +752,12 @@ class PortfolioHealthAnalyzer:
         if combined.empty:
             return {"series": [], "benchmarks": bench, "message": "No combined data"}
 
-        normalized = combined.copy()
-        for col in normalized.columns:
-            base = normalized[col].iloc[0]
-            normalized[col] = (normalized[col] / base * 100) if base else normalized[col]
+        # Columns with a zero base are left unscaled
+        base = combined.iloc[0].replace(0, np.nan)
+        normalized = combined.div(base, axis=1).mul(100).fillna(combined)
 
-        output = [
-            {"date": idx.strftime("%Y-%m-%d"), **{col: round(val, 2) for col, val in row.items()}}
-            for idx, row in normalized.iterrows()
-        ]
+        normalized.index = normalized.index.strftime("%Y-%m-%d")
+        output = normalized.round(2).reset_index(names="date").to_dict("records")
 
         return {
             "series": output,
@@ -649,10 +766,13 @@ class PortfolioHealthAnalyzer:
             "fx_rates": fx_rates,
         }
 
-    def _calculate_sharpe_ratio(self, positions: List[Dict]) -> Dict:
+    def _calculate_sharpe_ratio(self, positions: List[PositionEUR], returns_df: pd.DataFrame) -> Dict:
         """
         Calculate Sharpe Ratio (risk-adjusted returns)
 
+        Uses the value-weighted daily portfolio return series, so volatility
+        reflects the covariance between positions.
+
         Sharpe > 2.0 = Excellent
         Sharpe > 1.0 = Good
         Sharpe > 0.5 = Fair
@@ -662,22 +782,38 @@ class PortfolioHealthAnalyzer:
             if not positions:
                 return {'ratio': 0, 'assessment': 'N/A', 'message': 'No positions'}
 
-            # Calculate portfolio return
-            total_return = sum([p['gain_loss_pct'] for p in positions if p.get('cost_basis', 0) > 0])
-            avg_return = total_return / len(positions) if positions else 0
-
-            # Estimate annualized return (assuming holdings period)
-            ann_return = avg_return  # Simplified - in reality would need time period
-
-            # Calculate portfolio volatility (std dev of returns)
-            returns = [p['gain_loss_pct'] for p in positions if p.get('cost_basis', 0) > 0]
-            volatility = np.std(returns) if returns else 0
-
-            # Risk-free rate (assume 4% treasury)
-            risk_free_rate = 4.0
-
-            # Sharpe ratio = (Return - Risk Free Rate) / Volatility
-            sharpe = (ann_return - risk_free_rate) / volatility if volatility > 0 else 0
+            # Value weights per ticker, keyed like the get_multiple_stocks
+            # result that returns_df was built from
+            values = pd.Series(
+                [p.current_value for p in positions],
+                index=[normalize_ticker(p.ticker) for p in positions]
+            ).groupby(level=0).sum()
+            without_history = values.index.difference(returns_df.columns)
+            if len(without_history):
+                logger.warning(f"Sharpe ratio excludes positions without price history: {', '.join(without_history)}")
+            weights = values.reindex(returns_df.columns).fillna(0.0).to_numpy()
+            weight_total = weights.sum()
+            if returns_df.empty or weight_total <= 0:
+                return {'ratio': 0, 'assessment': 'N/A', 'message': 'Insufficient price history'}
+
+            # Daily portfolio returns (a missing quote day counts as no move)
+            port_returns = returns_df.fillna(0.0).to_numpy() @ (weights / weight_total)
+
+            # Annualized return and volatility, in percent
+            ann_return = ((1 + port_returns.mean()) ** _TRADING_DAYS - 1) * 100
+            volatility = port_returns.std(ddof=1) * np.sqrt(_TRADING_DAYS) * 100 if len(port_returns) > 1 else 0
+
+            # Daily risk-free rate for each return date (annual percent -> daily)
+            dates = pd.DatetimeIndex(returns_df.index)
+            if dates.tz is not None:
+                dates = dates.tz_localize(None)
+            risk_free_rates = self._get_risk_free_rates(dates.normalize())
+            rf_daily = (1 + risk_free_rates / 100) ** (1 / _TRADING_DAYS) - 1
+
+            # Sharpe ratio = annualized mean / std of daily excess returns
+            excess = port_returns - rf_daily
+            excess_std = excess.std(ddof=1) if len(excess) > 1 else 0
+            sharpe = np.sqrt(_TRADING_DAYS) * excess.mean() / excess_std if excess_std > 0 else 0
 
             # Assessment
             if sharpe > 2.0:
@@ -694,8 +830,9 @@ class PortfolioHealthAnalyzer:
             return {
                 'ratio': round(float(sharpe), 2),
                 'assessment': assessment,
-                'annual_return': round(ann_return, 2),
-                'volatility': round(volatility, 2),
+                'annual_return': round(float(ann_return), 2),
+                'volatility': round(float(volatility), 2),
+                'risk_free_rate': round(float(risk_free_rates[-1]), 2),
                 'message': f'Sharpe Ratio: {sharpe:.2f} - {assessment}'
             }
 
@@ -703,7 +840,31 @@ class PortfolioHealthAnalyzer:
             logger.error(f"Error calculating Sharpe ratio: {str(e)}")
             return {'ratio': 0, 'assessment': 'N/A', 'message': 'Sharpe ratio unavailable'}
 
-    def _compare_to_benchmark(self, positions: List[Dict]) -> Dict:
+    def _get_risk_free_rates(self, dates: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Annual risk-free rate (percent) for each date.
+
+        Uses the FRED 3-month T-bill series via the shared MacroAnalyzer
+        (cached for a day), carrying the last observation forward; falls back
+        to a constant rate. Failed fetches are not cached, so the next call
+        retries.
+        """
+        series = self._risk_free_cache.get(_RISK_FREE_SERIES)
+        if series is None:
+            start = (datetime.now() - timedelta(days=400)).strftime("%Y-%m-%d")
+            series = get_macro_analyzer().get_series(_RISK_FREE_SERIES, observation_start=start)
+            if series is not None:
+                series = series.dropna().sort_index()
+                if series.empty:
+                    series = None
+                else:
+                    self._risk_free_cache[_RISK_FREE_SERIES] = series
+
+        if series is None:
+            return np.full(len(dates), _FALLBACK_RISK_FREE_RATE)
+        return series.reindex(dates, method="ffill").fillna(_FALLBACK_RISK_FREE_RATE).to_numpy(dtype=np.float64)
+
+    def _compare_to_benchmark(self, positions: List[PositionEUR]) -> Dict:
         """
         Compare portfolio performance to S&P 500 benchmark
 
@@ -714,8 +875,8 @@ class PortfolioHealthAnalyzer:
                 return {'alpha': 0, 'message': 'No positions'}
 
             # Calculate portfolio return
-            total_gain_loss = sum([p['gain_loss'] for p in positions])
-            total_cost = sum([p['cost_basis'] for p in positions if p['cost_basis'] > 0])
+            total_gain_loss = sum(p.gain_loss for p in positions)
+            total_cost = sum(p.cost_basis for p in positions if p.cost_basis > 0)
             portfolio_return = (total_gain_loss / total_cost * 100) if total_cost > 0 else 0
 
             # Get S&P 500 (SPY) performance for comparison
@@ -760,7 +921,7 @@ class PortfolioHealthAnalyzer:
             logger.error(f"Error comparing to benchmark: {str(e)}")
             return {'alpha': 0, 'message': 'Benchmark comparison unavailable'}
 
-    def _calculate_performance_metrics(self, positions: List[Dict], total_value: float) -> Dict:
+    def _calculate_performance_metrics(self, positions: List[PositionEUR], total_value: float) -> Dict:
         """
         Calculate detailed performance metrics
 
@@ -778,35 +939,37 @@ class PortfolioHealthAnalyzer:
                     'worst_performer': None
                 }
 
+            returns = np.fromiter((p.gain_loss_pct for p in positions), dtype=np.float64, count=len(positions))
+
             # Count winners and losers
-            winners = [p for p in positions if p['gain_loss_pct'] > 0]
-            losers = [p for p in positions if p['gain_loss_pct'] < 0]
-            neutral = len(positions) - len(winners) - len(losers)
+            winners = int(np.count_nonzero(returns > 0))
+            losers = int(np.count_nonzero(returns < 0))
+            neutral = len(positions) - winners - losers
 
-            win_rate = (len(winners) / len(positions) * 100) if positions else 0
+            win_rate = (winners / len(positions) * 100) if positions else 0
 
-            # Find best and worst performers
-            best = max(positions, key=lambda x: x['gain_loss_pct'])
-            worst = min(positions, key=lambda x: x['gain_loss_pct'])
+            # Find best and worst performers (first one on ties)
+            best = positions[int(returns.argmax())]
+            worst = positions[int(returns.argmin())]
 
             return {
                 'total_positions': len(positions),
-                'winners': len(winners),
-                'losers': len(losers),
+                'winners': winners,
+                'losers': losers,
                 'neutral': neutral,
                 'win_rate': round(win_rate, 1),
                 'best_performer': {
-                    'ticker': best['ticker'],
-                    'return': round(best['gain_loss_pct'], 2),
-                    'value': round(best['current_value'], 2)
+                    'ticker': best.ticker,
+                    'return': round(best.gain_loss_pct, 2),
+                    'value': round(best.current_value, 2)
                 },
                 'worst_performer': {
-                    'ticker': worst['ticker'],
-                    'return': round(worst['gain_loss_pct'], 2),
-                    'value': round(worst['current_value'], 2)
+                    'ticker': worst.ticker,
+                    'return': round(worst.gain_loss_pct, 2),
+                    'value': round(worst.current_value, 2)
                 },
-                'avg_position_return': round(sum([p['gain_loss_pct'] for p in positions]) / len(positions), 2),
-                'message': f'{len(winners)} winners, {len(losers)} losers - {win_rate:.1f}% win rate'
+                'avg_position_return': round(float(returns.mean()), 2),
+                'message': f'{winners} winners, {losers} losers - {win_rate:.1f}% win rate'
             }
 
         except Exception as e:
@@ -1435,7 +1435,8 @@ class StockPredictor:
     def calculate_strength_score(
         self,
         ticker: str,
-        data: Optional[pd.DataFrame] = None
+        data: Optional[pd.DataFrame] = None,
+        ml_predictions: Optional[Dict[str, Dict]] = None
     ) -> Optional[Dict]:
         """
         Calculate comprehensive strength score (0-100)
@@ -1452,6 +1453,8 @@ class StockPredictor:
         Args:
             ticker: Stock ticker symbol
             data: Optional pre-loaded data
+            ml_predictions: Optional batch ML results keyed by ticker
+                (fetched for this ticker alone if None)
 
         Returns:
             Dictionary with score and analysis
@@ -1470,7 +1473,10 @@ class StockPredictor:
             trend_score = self._calculate_trend_score(data) * 0.75          # Scale 20 -> 15
 
             # NEW: ML Prediction Score (15 points)
-            ml_score = self._calculate_ml_score(ticker)
+            if ml_predictions is None:
+                ml_score = self._calculate_ml_score(ticker)
+            else:
+                ml_score = self._ml_score_from_prediction(ticker, ml_predictions.get(ticker))
 
             # NEW: Social Sentiment Score (10 points)
             sentiment_score = self._calculate_social_sentiment_score(ticker)
@@ -1770,22 +1776,24 @@ class StockPredictor:
     def _calculate_ml_score(self, ticker: str) -> float:
         """Calculate ML prediction score (0-15 points)"""
         try:
-            prediction_result = self.ml_predictor.predict_stock(ticker)
-
-            if not prediction_result:
-                return 7.5  # Neutral score if prediction fails
-
-            # ML prediction is probability 0-1, scale to 0-15
-            prediction_prob = prediction_result.get('prediction', 0.5)
-            ml_score = prediction_prob * 15
-
-            logger.info(f"{ticker} ML prediction: {prediction_prob:.3f} -> {ml_score:.2f}/15 points")
-            return ml_score
+            return self._ml_score_from_prediction(ticker, self.ml_predictor.predict_stock(ticker))
 
         except Exception as e:
             logger.error(f"Error calculating ML score for {ticker}: {str(e)}")
             return 7.5  # Neutral on error
 
+    def _ml_score_from_prediction(self, ticker: str, prediction_result: Optional[Dict]) -> float:
+        """Scale an ML prediction dict to 0-15 points (neutral 7.5 if missing)"""
+        if not prediction_result:
+            return 7.5  # Neutral score if prediction fails
+
+        # ML prediction is probability 0-1, scale to 0-15
+        prediction_prob = prediction_result.get('prediction', 0.5)
+        ml_score = prediction_prob * 15
+
+        logger.info(f"{ticker} ML prediction: {prediction_prob:.3f} -> {ml_score:.2f}/15 points")
+        return ml_score
+
     def _calculate_social_sentiment_score(self, ticker: str) -> float:
         """Calculate social sentiment score (0-10 points)"""
         try:
@@ -2040,17 +2048,30 @@ class CryptoPredictor:
 
         cryptos_with_scores = []
 
+        # Get crypto data
+        crypto_data = {}
         for symbol in symbols:
             try:
                 logger.info(f"Analyzing {symbol}...")
 
-                # Get crypto data
                 data = self.get_crypto_data(symbol)
                 if data is None or len(data) < 20:
                     continue
+                crypto_data[symbol] = data
+
+            except Exception as e:
+                logger.error(f"Error analyzing {symbol}: {str(e)}")
+
+        # Score every symbol's ML prediction in one batch
+        ml_predictions = {
+            result['ticker']: result
+            for result in get_ml_predictor().predict_stocks(list(crypto_data))
+        } if crypto_data else {}
 
+        for symbol, data in crypto_data.items():
+            try:
                 # Calculate strength score
-                score_data = self.calculate_strength_score(symbol, data)
+                score_data = self.calculate_strength_score(symbol, data, ml_predictions)
 
                 if score_data:
                     current_price = data['Close'].iloc[-1]
@@ -2097,7 +2118,8 @@ class CryptoPredictor:
     def calculate_strength_score(
         self,
         symbol: str,
-        data: Optional[pd.DataFrame] = None
+        data: Optional[pd.DataFrame] = None,
+        ml_predictions: Optional[Dict[str, Dict]] = None
     ) -> Optional[Dict]:
         """
         Calculate crypto strength score (0-100)
@@ -2108,7 +2130,7 @@ class CryptoPredictor:
         predictor = StockPredictor()
         predictor.lookback_days = self.lookback_days
 
-        return predictor.calculate_strength_score(symbol, data)
+        return predictor.calculate_strength_score(symbol, data, ml_predictions)
 
     def get_crypto_data(self, symbol: str) -> Optional[pd.DataFrame]:
         """
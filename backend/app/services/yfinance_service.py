@@ -27,12 +27,17 @@ import math
 import time
 import sys
 import importlib
+import inspect
+import threading
+from functools import wraps
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from collections import deque
+from copy import deepcopy
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 import os
 import re
+from cachetools import TTLCache
 
 _DEFAULT_CACHE_DIR = os.getenv("YFINANCE_CACHE_DIR", "/tmp/py-yfinance")
 os.environ.setdefault("XDG_CACHE_HOME", "/tmp")
@@ -48,6 +53,10 @@ _RATE_LIMIT_HINTS = ("rate limited", "too many requests")
 _TICKER_PATTERN = re.compile(r"^[A-Z0-9]{1,10}(-[A-Z]{1,2})?(\.[A-Z]{1,4})?$")
 # Default timeout for yfinance calls in seconds
 _YFINANCE_TIMEOUT = 30
+# In-process result caches (seconds), in front of the shared data manager cache
+_QUOTE_MEMO_TTL = 60
+_HISTORY_MEMO_TTL = 300
+_FUNDAMENTALS_MEMO_TTL = 3600
 
 
 def _with_timeout(func, timeout: int = _YFINANCE_TIMEOUT, default=None):
@@ -78,7 +87,59 @@ _SPECIAL_TICKERS = {
 }
 
 
-def _normalize_ticker(ticker: str) -> Optional[str]:
+def _memoize_results(ttl: int, maxsize: int = 4096):
+    """
+    Per-process TTL cache for a YFinanceService accessor.
+
+    Keyed by the bound call arguments with defaults applied and the ticker
+    normalized, so positional/keyword spellings of the same call share an
+    entry. Only non-empty results are kept, so a miss that queued a
+    background fetch is retried on the next call, and use_cache=False
+    bypasses the layer. Callers always get a deep copy, since they may
+    modify the returned dict/DataFrame.
+    """
+    def decorator(func):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        lock = threading.Lock()
+        signature = inspect.signature(func)
+
+        def copy_result(result):
+            return result.copy() if isinstance(result, pd.DataFrame) else deepcopy(result)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            if arguments.get("use_cache") is False:
+                return func(self, *args, **kwargs)
+
+            ticker = normalize_ticker(arguments.get("ticker"))
+            if not ticker:
+                return func(self, *args, **kwargs)
+            key = tuple(
+                (name, ticker if name == "ticker" else value)
+                for name, value in arguments.items()
+                if name not in ("self", "use_cache")
+            )
+            with lock:
+                hit = cache.get(key)
+            if hit is not None:
+                return copy_result(hit)
+
+            result = func(self, *args, **kwargs)
+            if result is None or (isinstance(result, pd.DataFrame) and result.empty):
+                return result
+            with lock:
+                cache[key] = result
+            return copy_result(result)
+
+        return wrapper
+    return decorator
+
+
+def normalize_ticker(ticker: str) -> Optional[str]:
+    """Upper-cased Yahoo symbol for ticker, or None if it is not a valid one"""
     if not ticker:
         return None
     normalized = str(ticker).strip().upper()
@@ -328,6 +389,7 @@ class YFinanceService:
             logger.error(f"All retries failed: {last_error}")
         return None
 
+    @_memoize_results(_HISTORY_MEMO_TTL)
     def get_stock_data(
         self,
         ticker: str,
@@ -345,7 +407,7 @@ class YFinanceService:
             DataFrame with Open, High, Low, Close, Volume
         """
         try:
-            normalized = _normalize_ticker(ticker)
+            normalized = normalize_ticker(ticker)
             if not normalized:
                 logger.debug("Skipping invalid ticker for yfinance stock data: %s", ticker)
                 return None
@@ -399,6 +461,7 @@ class YFinanceService:
             logger.error(f"Error fetching data for {ticker}: {str(e)}")
             return None
 
+    @_memoize_results(_QUOTE_MEMO_TTL)
     def get_quote(
         self,
         ticker: str,
@@ -414,7 +477,7 @@ class YFinanceService:
         Returns:
             Dict with current price, previous close, etc.
         """
-        normalized = _normalize_ticker(ticker)
+        normalized = normalize_ticker(ticker)
         if not normalized:
             logger.debug("Skipping invalid ticker for yfinance quote: %s", ticker)
             return None
@@ -534,6 +597,40 @@ class YFinanceService:
             logger.error(f"Error fetching quote for {ticker}: {str(e)}")
             return None
 
+    def get_multiple_quotes(
+        self,
+        tickers: List[str],
+        allow_external: Optional[bool] = None
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Get current quotes for several stocks.
+
+        Cache hits are read in one pipelined round-trip through the data
+        manager; only the misses fall back to per-ticker get_quote (and only
+        when external fetches are allowed).
+
+        Returns:
+            Dict mapping each requested ticker to its quote (None if unavailable)
+        """
+        normalized_map = {ticker: normalize_ticker(ticker) for ticker in tickers}
+        valid = sorted({n for n in normalized_map.values() if n})
+        allow_fetch = _resolve_allow_external(allow_external)
+
+        cached: Dict[str, Optional[Dict]] = {}
+        if self._data_manager and valid:
+            cached = self._data_manager.get_multiple_quotes(valid, queue_missing=allow_fetch)
+
+        results: Dict[str, Optional[Dict]] = {}
+        for ticker, normalized in normalized_map.items():
+            if not normalized:
+                results[ticker] = None
+                continue
+            quote = cached.get(normalized)
+            if quote is None and allow_fetch:
+                quote = self.get_quote(normalized, use_cache=False, allow_external=allow_fetch)
+            results[ticker] = quote
+        return results
+
     def _normalize_52_week_range(self, ticker: str, stock: "yf.Ticker", info: Dict) -> Dict[str, float]:
         current_price = info.get('currentPrice', info.get('regularMarketPrice', 0)) or 0
         high_52 = info.get('fiftyTwoWeekHigh', 0) or 0
@@ -572,6 +669,7 @@ class YFinanceService:
             'low': low_52
         }
 
+    @_memoize_results(_FUNDAMENTALS_MEMO_TTL)
     def get_fundamentals(
         self,
         ticker: str,
@@ -586,7 +684,7 @@ class YFinanceService:
         Returns:
             Dict with P/E, market cap, etc.
         """
-        normalized = _normalize_ticker(ticker)
+        normalized = normalize_ticker(ticker)
         if not normalized:
             logger.debug("Skipping invalid ticker for yfinance fundamentals: %s", ticker)
             return None
@@ -755,7 +853,7 @@ class YFinanceService:
 
         valid_tickers = []
         for ticker in tickers:
-            normalized = _normalize_ticker(ticker)
+            normalized = normalize_ticker(ticker)
             if normalized:
                 valid_tickers.append(normalized)
             else:
@@ -878,7 +976,7 @@ class YFinanceService:
         Uses rate limiting and auto-recovery from rate limit errors.
         Returns None on failure or empty data.
         """
-        normalized = _normalize_ticker(ticker)
+        normalized = normalize_ticker(ticker)
         if not normalized:
             logger.debug("Skipping invalid ticker for historical data: %s", ticker)
             return None
@@ -0,0 +1,13 @@
+"""
+Shared pytest setup for the backend service tests
+
+Run from backend/: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+# Make the ``app`` package importable regardless of the invocation directory
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
@@ -0,0 +1,83 @@
+"""
+Mock pick risk tiers and reasoning tiers vs the original score ladders
+"""
+
+import numpy as np
+
+from app.services import mock_data
+
+
+def _reference_risk(total_score: float) -> str:
+    if total_score > 75:
+        return "LOW"
+    elif total_score > 65:
+        return "MEDIUM"
+    else:
+        return "HIGH"
+
+
+def _reference_reasons(technical, momentum, volume, trend):
+    reasons = []
+    if technical > 24:
+        reasons.append("strong technical breakout pattern")
+    elif technical > 20:
+        reasons.append("favorable technical setup")
+
+    if momentum > 24:
+        reasons.append("exceptional price momentum")
+    elif momentum > 20:
+        reasons.append("positive momentum trend")
+
+    if volume > 16:
+        reasons.append("significant volume surge")
+    elif volume > 13:
+        reasons.append("above-average trading volume")
+
+    if trend > 16:
+        reasons.append("confirmed uptrend")
+    elif trend > 13:
+        reasons.append("emerging upward trend")
+    return reasons
+
+
+class _FixedRNG:
+    """Stands in for _RNG: each uniform() call returns the next given column"""
+
+    def __init__(self, *columns):
+        self._columns = [np.asarray(column, dtype=float) for column in columns]
+
+    def uniform(self, low, high, size):
+        column = self._columns.pop(0)
+        assert column.size == size
+        return column
+
+
+def _check(technical, momentum, volume, trend, total, risk, reason_tiers):
+    for i in range(len(total)):
+        assert mock_data._RISK_LEVELS[risk[i]] == _reference_risk(total[i])
+        reasons = [
+            phrases[tier]
+            for phrases, tier in zip(mock_data._REASON_PHRASES, reason_tiers[i])
+            if tier
+        ]
+        assert reasons == _reference_reasons(technical[i], momentum[i], volume[i], trend[i])
+
+
+def test_risk_and_reason_tiers_on_boundaries(monkeypatch):
+    # Totals land exactly on, just below and just above the 65/75 cut-offs,
+    # and every component hits its own ladder thresholds
+    technical = [20, 20, 24, 24, 20.5, 25, 18]
+    momentum = [20, 20, 24, 24, 24.5, 25, 18]
+    volume = [13, 13, 16, 16, 13.5, 17, 12]
+    trend = [12, 12.5, 11, 11.5, 16, 17, 12]
+    monkeypatch.setattr(mock_data, "_RNG", _FixedRNG(technical, momentum, volume, trend))
+
+    result = mock_data._pick_numerics(len(technical))
+
+    assert result[4].tolist() == [65, 65.5, 75, 75.5, 74.5, 84, 60]
+    _check(*result)
+
+
+def test_risk_and_reason_tiers_on_random_draws():
+    _check(*mock_data._pick_numerics(2000))
+
@@ -0,0 +1,124 @@
+"""
+News category/ticker regexes vs the original keyword and pattern scans
+"""
+
+import itertools
+import random
+import re
+from typing import Optional
+
+import pytest
+
+from app.services import news_service
+
+_REFERENCE_KEYWORDS = {
+    'FDA_APPROVAL': ['fda approv', 'fda clear', 'drug approv'],
+    'MERGER': ['merger', 'merge with'],
+    'ACQUISITION': ['acqui', 'acquire', 'acquisition'],
+    'BANKRUPTCY': ['bankrupt', 'chapter 11', 'chapter 7'],
+    'BUYOUT': ['buyout', 'buy out'],
+    'TAKEOVER': ['takeover', 'take over', 'hostile bid'],
+    'EARNINGS_BEAT': ['earnings beat', 'beat estimates', 'exceed expect', 'profit surge'],
+    'EARNINGS_MISS': ['earnings miss', 'miss estimates', 'below expect', 'profit drop'],
+    'IPO': ['ipo', 'initial public offering', 'going public'],
+    'INVESTIGATION': ['investigation', 'probe', 'inquiry', 'sec investigat'],
+    'LAWSUIT': ['lawsuit', 'sue', 'legal action', 'settlement'],
+    'RECALL': ['recall', 'safety issue', 'defect'],
+    'GUIDANCE_RAISED': ['guidance raised', 'raise forecast', 'raise outlook', 'upbeat guidance'],
+    'GUIDANCE_LOWERED': ['guidance lower', 'cut forecast', 'lower outlook', 'warn'],
+    'BREAKTHROUGH': ['breakthrough', 'revolutionary', 'game-chang'],
+    'ECONOMIC': ['fed', 'interest rate', 'inflation', 'gdp', 'unemployment'],
+    'CRYPTO': ['bitcoin', 'crypto', 'ethereum', 'blockchain']
+}
+
+_REFERENCE_TICKER_PATTERNS = [
+    r'\$([A-Z]{1,5})\b',
+    r'\((?:NASDAQ|NYSE|AMEX):\s*([A-Z]{1,5})\)',
+    r'\b([A-Z]{2,5})\s+(?:stock|shares|inc|corp)',
+]
+
+
+def _reference_category(title: str, description: str = '') -> str:
+    text = f"{title} {description}".lower()
+    for category, keywords in _REFERENCE_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in text:
+                return category
+    return 'GENERAL'
+
+
+def _reference_ticker(title: str, description: str = '') -> Optional[str]:
+    text = f"{title} {description}"
+    for pattern in _REFERENCE_TICKER_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(1)
+    return None
+
+
+ALL_KEYWORDS = [keyword for keywords in _REFERENCE_KEYWORDS.values() for keyword in keywords]
+
+# Keywords hiding inside longer words, and text that should stay GENERAL
+TRICKY_TEXTS = [
+    'Federal Reserve holds steady', 'a new issue of bonds', 'they pursue growth',
+    'Warning signs ahead', 'company acquires rival', 'Shipowners merge withdrawal',
+    'Chapter 70 of the book', 'Nothing to see here', '', 'GAME-CHANGING chip',
+    'ipod sales', 'biopharma probes', 'Unemployment falls', 'sued by regulators',
+]
+
+TICKER_TEXTS = [
+    '$AAPL jumps', 'Shares of $BRK surge', '$TOOLONG rally', '$a lower case',
+    'Apple (NASDAQ: AAPL) rises', 'Deal (NYSE:IBM) closes', '(AMEX:  SPY) flat',
+    '(OTC: ABCD) ignored', 'TSLA stock falls', 'MSFT shares gain', 'NVDA inc news',
+    'GOOGL corp update', 'A stock with one letter', 'ACME Corp', 'ABCDEF stock',
+    'TSLA stock and $AAPL', '(NASDAQ: AMD) and $INTC', 'no ticker at all',
+]
+
+
+def _random_text(rng: random.Random) -> str:
+    words = ALL_KEYWORDS + ['market', 'shares', 'today', 'the', 'Corp', 'stock', '$XYZ',
+                            '(NYSE: ABC)', 'IBM', 'Fed', 'WARN', 'Ipo']
+    return ' '.join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+
+
+@pytest.mark.parametrize("keyword", ALL_KEYWORDS)
+def test_category_for_each_keyword(keyword):
+    for title in (keyword, keyword.upper(), f'Breaking: {keyword} news'):
+        assert news_service._detect_category(title) == _reference_category(title)
+
+
+@pytest.mark.parametrize("first, second", list(itertools.combinations(ALL_KEYWORDS, 2))[::7])
+def test_category_priority_follows_keyword_table(first, second):
+    # Table order wins, not position in the text
+    for title in (f'{first} then {second}', f'{second} then {first}'):
+        assert news_service._detect_category(title) == _reference_category(title)
+
+
+@pytest.mark.parametrize("text", TRICKY_TEXTS)
+def test_category_on_embedded_keywords(text):
+    assert news_service._detect_category(text) == _reference_category(text)
+
+
+def test_category_spans_title_and_description():
+    # The original scan joined title and description with a space
+    for title, description in [('FDA', 'approval granted'), ('chapter', '11 filing'), ('buy', 'out offer')]:
+        expected = _reference_category(title, description)
+        assert news_service._detect_category(title, description) == expected
+
+
+@pytest.mark.parametrize("text", TICKER_TEXTS)
+def test_ticker_patterns(text):
+    assert news_service._extract_ticker(text) == _reference_ticker(text)
+
+
+def test_ticker_spans_title_and_description():
+    for title, description in [('Tesla', '(NASDAQ: TSLA) climbs'), ('Watch AMD', 'stock today')]:
+        assert news_service._extract_ticker(title, description) == _reference_ticker(title, description)
+
+
+def test_random_headlines_match_reference():
+    rng = random.Random(1234)
+    for _ in range(2000):
+        title, description = _random_text(rng), _random_text(rng)
+        assert news_service._detect_category(title, description) == _reference_category(title, description)
+        assert news_service._extract_ticker(title, description) == _reference_ticker(title, description)
@@ -0,0 +1,79 @@
+"""
+Options flow sentiment/signal lookup tables vs the original elif chains
+"""
+
+import itertools
+import math
+from typing import Optional
+
+import pytest
+
+from app.services.options_flow_service import OptionsFlowService
+
+
+def _reference_sentiment(pc_ratio: float, unusual: bool) -> str:
+    if pc_ratio < 0.5 and unusual:
+        return "VERY_BULLISH"
+    elif pc_ratio < 0.7:
+        return "BULLISH"
+    elif pc_ratio > 1.5 and unusual:
+        return "VERY_BEARISH"
+    elif pc_ratio > 1.0:
+        return "BEARISH"
+    else:
+        return "NEUTRAL"
+
+
+def _reference_signal(pc_ratio: float, call_vol: int, put_vol: int, unusual: bool) -> Optional[str]:
+    if unusual and pc_ratio < 0.5 and call_vol > 1000:
+        return "UNUSUAL_CALL_ACTIVITY"
+    elif unusual and pc_ratio > 1.5 and put_vol > 1000:
+        return "UNUSUAL_PUT_ACTIVITY"
+    elif pc_ratio < 0.6 and call_vol > 5000:
+        return "HEAVY_CALL_VOLUME"
+    elif pc_ratio > 1.2 and put_vol > 5000:
+        return "HEAVY_PUT_VOLUME"
+    return None
+
+
+def _around(*boundaries):
+    """Each boundary plus its nearest float neighbours"""
+    values = []
+    for b in boundaries:
+        values.extend((math.nextafter(b, -math.inf), b, math.nextafter(b, math.inf)))
+    return values
+
+
+PC_RATIOS = [0.0, 0.3, 0.65, 0.85, 1.1, 1.35, 2.0, 10.0] + _around(0.5, 0.6, 0.7, 1.0, 1.2, 1.5)
+VOLUMES = [0, 999, 1000, 1001, 4999, 5000, 5001, 20000]
+
+
+@pytest.fixture(scope="module")
+def service():
+    return OptionsFlowService()
+
+
+def _data(call_vol, put_vol, unusual):
+    return {"call_volume": call_vol, "put_volume": put_vol, "unusual_activity": unusual}
+
+
+@pytest.mark.parametrize("pc_ratio", PC_RATIOS)
+@pytest.mark.parametrize("unusual", [False, True])
+def test_flow_sentiment_matches_elif_chain(service, pc_ratio, unusual):
+    sentiment = service._calculate_flow_sentiment(_data(0, 0, unusual), pc_ratio=pc_ratio)
+    assert sentiment.name == _reference_sentiment(pc_ratio, unusual)
+
+
+@pytest.mark.parametrize("pc_ratio", PC_RATIOS)
+@pytest.mark.parametrize("unusual", [False, True])
+def test_options_signal_matches_elif_chain(service, pc_ratio, unusual):
+    for call_vol, put_vol in itertools.product(VOLUMES, VOLUMES):
+        signal = service._generate_options_signal(_data(call_vol, put_vol, unusual), pc_ratio=pc_ratio)
+        expected = _reference_signal(pc_ratio, call_vol, put_vol, unusual)
+        assert (signal.name if signal else None) == expected, (pc_ratio, call_vol, put_vol, unusual)
+
+
+def test_pc_ratio_is_derived_when_not_passed(service):
+    data = _data(2000, 900, True)
+    assert service._calculate_flow_sentiment(data).name == _reference_sentiment(0.45, True)
+    assert service._generate_options_signal(data).name == _reference_signal(0.45, 2000, 900, True)
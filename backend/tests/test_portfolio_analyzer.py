@@ -0,0 +1,147 @@
+"""
+Portfolio FX memo and close-price alignment vs the original outer-join build
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from cachetools import TTLCache
+
+from app.services import portfolio_analyzer
+from app.services.portfolio_analyzer import PortfolioHealthAnalyzer
+
+_EUR_RATES = {"EURUSD=X": 1.10, "EURSEK=X": 11.5, "EURGBP=X": 0.85}
+
+
+class _StubYFinance:
+    def __init__(self, history=None, quotes=None):
+        self.history = history or {}
+        self.quotes = dict(_EUR_RATES if quotes is None else quotes)
+        self.quote_calls = []
+
+    def get_quote(self, ticker, allow_external=True):
+        self.quote_calls.append(ticker)
+        rate = self.quotes.get(ticker)
+        return {"c": rate} if rate else None
+
+    def get_multiple_stocks(self, tickers, period="1y", allow_external=True):
+        return {t: self.history[t] for t in tickers if t in self.history}
+
+
+def _analyzer(yfinance):
+    analyzer = PortfolioHealthAnalyzer.__new__(PortfolioHealthAnalyzer)
+    analyzer.yfinance = yfinance
+    analyzer._fx_cache = TTLCache(maxsize=64, ttl=300)
+    analyzer._fx_memo = TTLCache(maxsize=256, ttl=300)
+    return analyzer
+
+
+# --- FX memo ---------------------------------------------------------------
+
+def test_fx_rates_match_pair_inverses():
+    rates = _analyzer(_StubYFinance())._get_fx_rates(["USD", "SEK", "EUR", "GBP"])
+    assert rates == {
+        "EUR": 1.0,
+        "USD": pytest.approx(1 / 1.10),
+        "SEK": pytest.approx(1 / 11.5),
+        "GBP": pytest.approx(1 / 0.85),
+    }
+
+
+def test_fx_memo_is_keyed_on_the_currency_set():
+    yfinance = _StubYFinance()
+    analyzer = _analyzer(yfinance)
+
+    first = analyzer._get_fx_rates(["USD", "SEK"])
+    calls = len(yfinance.quote_calls)
+    # Same set in another order (and with duplicates) is served from the memo
+    assert analyzer._get_fx_rates(["SEK", "USD", "USD"]) == first
+    assert len(yfinance.quote_calls) == calls
+
+
+def test_fx_memo_hands_out_copies():
+    analyzer = _analyzer(_StubYFinance())
+    first = analyzer._get_fx_rates(["USD"])
+    first["USD"] = 0.0
+    assert analyzer._get_fx_rates(["USD"])["USD"] == pytest.approx(1 / 1.10)
+
+
+def test_fx_memo_skips_incomplete_lookups():
+    yfinance = _StubYFinance(quotes={"EURUSD=X": 1.10})
+    analyzer = _analyzer(yfinance)
+
+    assert "SEK" not in analyzer._get_fx_rates(["USD", "SEK"])
+    yfinance.quotes["EURSEK=X"] = 11.5
+    assert analyzer._get_fx_rates(["USD", "SEK"])["SEK"] == pytest.approx(1 / 11.5)
+
+
+# --- Performance series alignment -------------------------------------------
+
+def _reference_series(holdings, history, bench, fx_rates):
+    """The original per-holding outer join + ffill build, normalized to 100"""
+    series_list = []
+    for holding in holdings:
+        ticker = holding["ticker"]
+        df = history.get(ticker)
+        if df is None or df.empty:
+            continue
+        currency = holding.get("currency") or portfolio_analyzer._guess_currency(ticker)
+        values = df["Close"] * float(holding["shares"]) * fx_rates.get(currency, 1.0)
+        series_list.append(values.rename(ticker))
+
+    portfolio_series = pd.concat(series_list, axis=1, join="outer").sort_index().ffill().dropna().sum(axis=1)
+    combined = pd.DataFrame({"portfolio": portfolio_series})
+    for ticker in bench:
+        if ticker in history:
+            combined = combined.join(history[ticker]["Close"].rename(ticker), how="outer")
+    combined = combined.sort_index().ffill().dropna()
+
+    normalized = combined.copy()
+    for col in normalized.columns:
+        base = normalized[col].iloc[0]
+        normalized[col] = (normalized[col] / base * 100) if base else normalized[col]
+    return [
+        {"date": idx.strftime("%Y-%m-%d"), **{col: round(val, 2) for col, val in row.items()}}
+        for idx, row in normalized.iterrows()
+    ]
+
+
+def _closes(dates, seed):
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    return pd.DataFrame({"Close": values}, index=pd.DatetimeIndex(dates))
+
+
+DAYS = pd.bdate_range("2024-01-01", periods=40)
+
+CALENDARS = {
+    # Every holding trades on the same days: the inner join is used as-is
+    "aligned": {"AAPL": DAYS, "MSFT": DAYS, "NOKIA.HE": DAYS},
+    # One holding misses a day in the middle
+    "gap": {"AAPL": DAYS, "MSFT": DAYS.delete(17), "NOKIA.HE": DAYS},
+    # One holding starts trading later
+    "late_start": {"AAPL": DAYS, "MSFT": DAYS[5:], "NOKIA.HE": DAYS},
+    # Different exchange holidays on both sides
+    "holidays": {"AAPL": DAYS.delete([3, 30]), "MSFT": DAYS, "NOKIA.HE": DAYS.delete(12)},
+}
+
+
+@pytest.mark.parametrize("calendar", list(CALENDARS))
+def test_performance_series_matches_outer_join_build(calendar):
+    history = {ticker: _closes(dates, seed) for seed, (ticker, dates) in enumerate(CALENDARS[calendar].items())}
+    history["SPY"] = _closes(DAYS, 99)
+    holdings = [
+        {"ticker": "AAPL", "shares": 10, "currency": "USD"},
+        {"ticker": "MSFT", "shares": 4},
+        {"ticker": "NOKIA.HE", "shares": 250},
+        # Repeated ticker: both lots count towards the portfolio value
+        {"ticker": "AAPL", "shares": 5, "currency": "USD"},
+    ]
+    analyzer = _analyzer(_StubYFinance(history=history))
+
+    result = analyzer.get_portfolio_performance_series(holdings, benchmarks=["SPY"])
+
+    expected = _reference_series(holdings, history, ["SPY"], result["fx_rates"])
+    assert [row["date"] for row in result["series"]] == [row["date"] for row in expected]
+    for row, expected_row in zip(result["series"], expected):
+        assert row == pytest.approx(expected_row, abs=0.011)
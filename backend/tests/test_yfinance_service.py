@@ -0,0 +1,102 @@
+"""
+_memoize_results key binding and copy semantics
+"""
+
+import pandas as pd
+import pytest
+
+from app.services.yfinance_service import _memoize_results
+
+
+def _make_accessor(result_factory):
+    """Fresh stand-in for a YFinanceService accessor (the memo is per function)"""
+
+    class Accessor:
+        calls = 0
+
+        @_memoize_results(ttl=60)
+        def get(self, ticker: str, period: str = "1y", use_cache: bool = True, allow_external: bool = False):
+            self.calls += 1
+            return result_factory(ticker, period)
+
+    return Accessor()
+
+
+def _fundamentals(ticker, period):
+    return {"ticker": ticker, "period": period, "officers": [{"name": "CEO"}], "ratios": {"pe": 20.0}}
+
+
+@pytest.fixture
+def accessor():
+    return _make_accessor(_fundamentals)
+
+
+def test_positional_keyword_and_default_spellings_share_an_entry(accessor):
+    first = accessor.get("AAPL")
+    assert accessor.get("AAPL", "1y") == first
+    assert accessor.get("AAPL", period="1y") == first
+    assert accessor.get(ticker="AAPL", allow_external=False) == first
+    assert accessor.get("AAPL", "1y", True, False) == first
+    assert accessor.calls == 1
+
+
+def test_ticker_is_normalized_in_the_key(accessor):
+    accessor.get("AAPL")
+    accessor.get(" aapl ")
+    assert accessor.calls == 1
+
+
+def test_different_arguments_get_separate_entries(accessor):
+    accessor.get("AAPL")
+    accessor.get("AAPL", "6mo")
+    accessor.get("AAPL", allow_external=True)
+    accessor.get("MSFT")
+    assert accessor.calls == 4
+
+
+@pytest.mark.parametrize("call", [
+    lambda a: a.get("AAPL", use_cache=False),
+    lambda a: a.get("AAPL", "1y", False),
+])
+def test_use_cache_false_bypasses_the_layer(accessor, call):
+    accessor.get("AAPL")
+    call(accessor)
+    call(accessor)
+    assert accessor.calls == 3
+
+
+def test_invalid_ticker_is_not_cached(accessor):
+    accessor.get("not a ticker!")
+    accessor.get("not a ticker!")
+    assert accessor.calls == 2
+
+
+def test_empty_results_are_not_cached():
+    accessor = _make_accessor(lambda ticker, period: None)
+    assert accessor.get("AAPL") is None
+    assert accessor.get("AAPL") is None
+    assert accessor.calls == 2
+
+
+def test_dict_results_are_deep_copied(accessor):
+    first = accessor.get("AAPL")
+    first["ratios"]["pe"] = -1.0
+    first["officers"].append({"name": "CFO"})
+    first["ticker"] = "XXX"
+
+    second = accessor.get("AAPL")
+    assert second == _fundamentals("AAPL", "1y")
+    assert second is not first
+    assert accessor.calls == 1
+
+
+def test_dataframe_results_are_copied():
+    frame = pd.DataFrame({"Close": [1.0, 2.0, 3.0]})
+    accessor = _make_accessor(lambda ticker, period: frame)
+
+    first = accessor.get("AAPL")
+    first.loc[0, "Close"] = 99.0
+
+    second = accessor.get("AAPL")
+    assert second["Close"].tolist() == [1.0, 2.0, 3.0]
+    assert accessor.calls == 1